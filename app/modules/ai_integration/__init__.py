@@ -3,12 +3,22 @@ AI Integration Module for Unified Dashboard
 
 This module provides AI-powered market intelligence features
 using Perplexity AI API as a core component of the dashboard.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+the package does not pull in the HTTP client and database code until a
+class is actually used.
 """
 
-from .perplexity_client import PerplexityClient, TimeFrame
-from .commodity_queries import CommodityQueryOrchestrator
-from .data_processor import DataProcessor
-from .ai_database import AIDatabase
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'PerplexityClient': 'perplexity_client',
+    'TimeFrame': 'perplexity_client',
+    'CommodityQueryOrchestrator': 'commodity_queries',
+    'DataProcessor': 'data_processor',
+    'AIDatabase': 'ai_database',
+}
 
 __all__ = [
     'PerplexityClient',
@@ -16,4 +26,17 @@ __all__ = [
     'CommodityQueryOrchestrator',
     'DataProcessor',
     'AIDatabase'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
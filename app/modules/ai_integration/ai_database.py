@@ -3,10 +3,15 @@ AI Database Interface for Unified Dashboard
 Extends SQL dashboard's DatabaseConnection with AI-specific operations
 """
 
+import atexit
+import functools
 import json
 import logging
 import os
 import re
+import threading
+import weakref
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
@@ -15,9 +20,196 @@ from sqlalchemy import text
 # Import the existing DatabaseConnection from SQL dashboard
 from ..db_connection import DatabaseConnection, get_connection_string
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjson is optional
+    ORJSON_AVAILABLE = False
+
 # Get logger (don't call basicConfig - let main.py configure it)
 logger = logging.getLogger(__name__)
 
+
+def _json_dumps(obj) -> str:
+    """
+    Serialize to a JSON string with orjson when available (falls back to json
+    for values orjson cannot serialize). Non-ASCII text is kept as UTF-8
+    rather than \\u escapes, which the NVARCHAR columns store as-is.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+def _json_loads(data):
+    """
+    Parse JSON with orjson when available (falls back to json, which also
+    accepts the NaN/Infinity tokens older json.dumps output may contain)
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+# Batch refreshes save queries, intelligence and news back to back; allow a
+# larger pool than the dashboard's read connection
+AI_POOL_OPTIONS = {'pool_size': 10, 'max_overflow': 20}
+
+# Insert or update the query cache using correct column names from schema.
+# UPDLOCK + SERIALIZABLE hold the key range until commit, so two writers of
+# the same (Commodity, Query_Date, Timeframe) cannot both fall through to INSERT.
+QUERY_CACHE_UPSERT = """
+UPDATE AI_Query_Cache WITH (UPDLOCK, SERIALIZABLE)
+SET Query_Response = :response,
+    Expires_At = :expires_at,
+    Cache_Hit_Count = Cache_Hit_Count + 1
+WHERE Commodity = :commodity
+    AND Query_Date = :query_date
+    AND Timeframe = :timeframe;
+
+IF @@ROWCOUNT = 0
+    INSERT INTO AI_Query_Cache (Commodity, Query_Date, Timeframe, Query_Response, Expires_At)
+    VALUES (:commodity, :query_date, :timeframe, :response, :expires_at);
+"""
+
+# Cache hit lookup; the hit count is buffered and flushed separately
+QUERY_CACHE_LOOKUP = """
+SELECT Query_Response, Created_At, Query_Date
+FROM AI_Query_Cache
+WHERE Commodity = :commodity
+    AND Query_Date = :query_date
+    AND Timeframe = :timeframe
+    AND Expires_At > GETDATE()
+"""
+
+# Buffered cache hits are written back at most this often (seconds)
+HIT_FLUSH_INTERVAL_SECONDS = 60
+
+# Rows per batched hit-count UPDATE (4 parameters each, under SQL Server's 2100 limit)
+HIT_FLUSH_CHUNK_SIZE = 500
+
+# Live AIDatabase instances, flushed once at interpreter exit without keeping them alive
+_LIVE_DATABASES = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_hit_counts():
+    """Write the buffered cache hits of every live AIDatabase"""
+    for database in list(_LIVE_DATABASES):
+        database.flush_hit_counts()
+
+
+# Block dangerous SQL characters and patterns (case-insensitive substrings of the name)
+_DANGEROUS_PATTERNS = (
+    ';', '--', '/*', '*/', 'xp_', 'sp_',  # SQL injection attempts
+    'DROP', 'DELETE', 'INSERT', 'UPDATE', 'EXEC',  # SQL keywords (case-insensitive)
+    'UNION', 'SELECT', 'FROM', 'WHERE'  # More SQL keywords
+)
+_DANGEROUS_RE = re.compile(
+    '|'.join(re.escape(pattern) for pattern in _DANGEROUS_PATTERNS), re.IGNORECASE
+)
+
+# Allow alphanumeric, spaces, hyphens, underscores, parentheses, and Unicode characters
+# Parentheses are needed for regional variants like "Rice (US)", "Steel (China)"
+# Unicode letters (\w with re.UNICODE) allows Vietnamese, Chinese, and other international characters
+# Also allow: / , & % . + for commodity names (e.g., "NPK 16-16-8+13S")
+_COMMODITY_NAME_RE = re.compile(r'^[\w\s\-_\(\)/,&%\.\+]+$', re.UNICODE)
+
+
+# Market intelligence text fields, e.g. "USD 105.30/ton" and "+2.5%"
+_PRICE_RE = re.compile(r'[\$]?\s*([\d,]+\.?\d*)')
+_PRICE_UNIT_RE = re.compile(r'/(\w+)')
+_PRICE_CHANGE_PCT_RE = re.compile(r'([+-]?\d+\.?\d*)%')
+
+# Date-prefixed news lines, e.g. "Jan 15: Prices rose on ..."
+_NEWS_DATE_PREFIX_RE = re.compile(r'^(\w+ \d+):\s*(.+)')
+
+
+@functools.lru_cache(maxsize=512)
+def _sanitize_commodity_name_cached(name: str) -> str:
+    """
+    Validate and strip one commodity name (see AIDatabase._sanitize_commodity_name).
+
+    The same few hundred names recur in every batch, so results are memoized;
+    invalid names raise and are therefore never cached.
+    """
+    # Strip whitespace first
+    name = name.strip()
+
+    # Check for mojibake (corrupted encoding) - common pattern: letter followed by ?
+    # This happens when UTF-8 Vietnamese characters are read with wrong encoding
+    if '?' in name:
+        raise ValueError(f"Commodity name contains corrupted characters: {name}")
+
+    match = _DANGEROUS_RE.search(name)
+    if match:
+        logger.warning(f"Blocked potential SQL injection attempt in commodity name: {name}")
+        raise ValueError(f"Invalid commodity name - contains forbidden pattern: {match.group(0)}")
+
+    if not _COMMODITY_NAME_RE.match(name):
+        raise ValueError(f"Invalid commodity name format: {name}")
+
+    # Length check (increased to accommodate longer international names)
+    if len(name) > 100:
+        raise ValueError(f"Commodity name too long: {name}")
+
+    return name
+
+def _news_items_from_frame(result_df: pd.DataFrame) -> List[Dict]:
+    """
+    Convert AI_News_Items rows into news item dictionaries
+
+    Reads each column once and zips them, which avoids building a Series
+    per row the way DataFrame.iterrows() does.
+    """
+    news_items = []
+    for headline, summary, source_urls, news_date, sentiment in zip(
+        result_df['Headline'].tolist(),
+        result_df['Summary'].tolist(),
+        result_df['Source_URLs'].tolist(),
+        result_df['News_Date'].tolist(),
+        result_df['Sentiment'].tolist()
+    ):
+        # Parse source URLs if JSON
+        if isinstance(source_urls, str):
+            try:
+                source_urls = _json_loads(source_urls)
+            except:
+                source_urls = [source_urls] if source_urls else []
+
+        news_items.append({
+            'headline': headline,
+            'summary': summary,
+            'sources': source_urls,
+            'date': news_date.isoformat() if hasattr(news_date, 'isoformat') else str(news_date),
+            'sentiment': sentiment
+        })
+    return news_items
+
+def _intelligence_from_row(current_price, price_change_pct, trend, key_drivers, analysis_date) -> Dict:
+    """Convert one AI_Market_Intelligence row into a market intelligence dictionary"""
+    # Parse key drivers if JSON
+    if isinstance(key_drivers, str):
+        try:
+            key_drivers = _json_loads(key_drivers)
+        except:
+            # Try splitting by semicolon if not JSON
+            key_drivers = [d.strip() for d in key_drivers.split(';')] if key_drivers else []
+
+    return {
+        'current_price': current_price,
+        'price_change': f"{price_change_pct:.1f}%" if pd.notna(price_change_pct) else 'N/A',
+        'trend': trend if pd.notna(trend) else 'unknown',
+        'key_drivers': key_drivers if key_drivers else [],
+        'price_outlook': '',  # Column doesn't exist in table
+        'analysis_date': analysis_date.isoformat() if hasattr(analysis_date, 'isoformat') else str(analysis_date)
+    }
+
 def get_ai_connection_string() -> str:
     """
     Get SQL Server connection string for AI operations
@@ -44,8 +236,14 @@ class AIDatabase:
         """Initialize AI database connection"""
         try:
             self.connection_string = get_ai_connection_string()
-            self.db = DatabaseConnection(self.connection_string)
+            self.db = DatabaseConnection(self.connection_string, pool_options=AI_POOL_OPTIONS)
             self.has_write_access = self._check_write_access()
+
+            # Cache hits counted in memory: (commodity, query_date, timeframe) -> hits
+            self._hit_buffer = defaultdict(int)
+            self._hit_lock = threading.Lock()
+            self._hit_flush_timer = None
+            _LIVE_DATABASES.add(self)
             logger.info(f"AI Database initialized (write access: {self.has_write_access})")
         except Exception as e:
             logger.error(f"Failed to initialize AI database: {e}")
@@ -130,40 +328,7 @@ class AIDatabase:
         """
         if not name or not isinstance(name, str):
             raise ValueError("Invalid commodity name: must be a non-empty string")
-
-        # Strip whitespace first
-        name = name.strip()
-
-        # Check for mojibake (corrupted encoding) - common pattern: letter followed by ?
-        # This happens when UTF-8 Vietnamese characters are read with wrong encoding
-        if '?' in name:
-            raise ValueError(f"Commodity name contains corrupted characters: {name}")
-
-        # Block dangerous SQL characters and patterns
-        dangerous_patterns = [
-            ';', '--', '/*', '*/', 'xp_', 'sp_',  # SQL injection attempts
-            'DROP', 'DELETE', 'INSERT', 'UPDATE', 'EXEC',  # SQL keywords (case-insensitive)
-            'UNION', 'SELECT', 'FROM', 'WHERE'  # More SQL keywords
-        ]
-
-        name_upper = name.upper()
-        for pattern in dangerous_patterns:
-            if pattern in name_upper:
-                logger.warning(f"Blocked potential SQL injection attempt in commodity name: {name}")
-                raise ValueError(f"Invalid commodity name - contains forbidden pattern: {pattern}")
-
-        # Allow alphanumeric, spaces, hyphens, underscores, parentheses, and Unicode characters
-        # Parentheses are needed for regional variants like "Rice (US)", "Steel (China)"
-        # Unicode letters (\w with re.UNICODE) allows Vietnamese, Chinese, and other international characters
-        # Also allow: / , & % . + for commodity names (e.g., "NPK 16-16-8+13S")
-        if not re.match(r'^[\w\s\-_\(\)/,&%\.\+]+$', name, re.UNICODE):
-            raise ValueError(f"Invalid commodity name format: {name}")
-
-        # Length check (increased to accommodate longer international names)
-        if len(name) > 100:
-            raise ValueError(f"Commodity name too long: {name}")
-
-        return name
+        return _sanitize_commodity_name_cached(name)
 
     def save_query_result(self, commodity: str, query_type: str, timeframe: str, result: Dict, query_date: Optional[datetime.date] = None) -> bool:
         """
@@ -183,50 +348,14 @@ class AIDatabase:
             logger.warning("No write access - cannot save query results")
             return False
 
-        try:
-            # Sanitize inputs
-            commodity = self._sanitize_commodity_name(commodity)
-
-            # Serialize the result
-            result_json = json.dumps(result)
-            # Use provided query_date or default to today
-            actual_query_date = query_date if query_date else datetime.now().date()
-            expires_at = datetime.now() + timedelta(hours=24)
+        self.flush_hit_counts()
 
-            # Insert or update the cache using correct column names from schema
-            insert_query = """
-            MERGE AI_Query_Cache AS target
-            USING (
-                SELECT
-                    :commodity AS Commodity,
-                    :query_date AS Query_Date,
-                    :timeframe AS Timeframe
-            ) AS source
-            ON target.Commodity = source.Commodity
-                AND target.Query_Date = source.Query_Date
-                AND target.Timeframe = source.Timeframe
-            WHEN MATCHED THEN
-                UPDATE SET
-                    Query_Response = :response,
-                    Expires_At = :expires_at,
-                    Cache_Hit_Count = Cache_Hit_Count + 1
-            WHEN NOT MATCHED THEN
-                INSERT (Commodity, Query_Date, Timeframe, Query_Response, Expires_At)
-                VALUES (:commodity, :actual_query_date, :timeframe, :response, :expires_at);
-            """
+        try:
+            params = self._query_cache_params(commodity, timeframe, result, query_date)
+            commodity = params['commodity']
 
             with self.db.engine.connect() as conn:
-                conn.execute(
-                    text(insert_query),
-                    {
-                        'commodity': commodity,
-                        'actual_query_date': actual_query_date,
-                        'query_date': actual_query_date,
-                        'timeframe': timeframe,
-                        'response': result_json,
-                        'expires_at': expires_at
-                    }
-                )
+                conn.execute(text(QUERY_CACHE_UPSERT), params)
                 conn.commit()
 
             logger.info(f"Saved query result for {commodity} ({timeframe})")
@@ -236,6 +365,115 @@ class AIDatabase:
             logger.error(f"Failed to save query result: {e}")
             return False
 
+    def _query_cache_params(self, commodity: str, timeframe: str, result: Dict,
+                            query_date: Optional[datetime.date] = None) -> Dict:
+        """
+        Build bind parameters for QUERY_CACHE_UPSERT
+
+        Raises:
+            ValueError: If the commodity name fails sanitization
+        """
+        # Use provided query_date or default to today
+        return {
+            'commodity': self._sanitize_commodity_name(commodity),
+            'query_date': query_date if query_date else datetime.now().date(),
+            'timeframe': timeframe,
+            'response': _json_dumps(result),
+            'expires_at': datetime.now() + timedelta(hours=24)
+        }
+
+    def _fetch_cached_row(self, commodity: str, query_date: datetime.date,
+                          timeframe: str) -> Optional[Dict]:
+        """
+        Fetch an unexpired AI_Query_Cache row and count the hit
+
+        The hit is only recorded in memory (see flush_hit_counts), so a cache
+        hit costs a single read and no write on the request path.
+
+        Returns:
+            Row as a dict (Query_Response, Created_At, Query_Date) or None on a miss
+        """
+        params = {
+            'commodity': commodity,
+            'query_date': query_date,
+            'timeframe': timeframe
+        }
+
+        with self.db.engine.connect() as conn:
+            row = conn.execute(text(QUERY_CACHE_LOOKUP), params).mappings().first()
+
+        if row is None:
+            return None
+
+        if self.has_write_access:
+            self._record_hit(commodity, query_date, timeframe)
+        return dict(row)
+
+    def _record_hit(self, commodity: str, query_date: datetime.date, timeframe: str):
+        """Buffer one cache hit and schedule a flush if none is pending"""
+        with self._hit_lock:
+            self._hit_buffer[(commodity, query_date, timeframe)] += 1
+            if self._hit_flush_timer is None:
+                self._hit_flush_timer = threading.Timer(HIT_FLUSH_INTERVAL_SECONDS, self.flush_hit_counts)
+                self._hit_flush_timer.daemon = True
+                self._hit_flush_timer.start()
+
+    def flush_hit_counts(self) -> int:
+        """
+        Write buffered cache hits to AI_Query_Cache.Cache_Hit_Count
+
+        All pending hits go out as batched UPDATEs joined against a VALUES
+        table. Hit counts are analytics only, so a failed flush is logged and
+        its counts are dropped rather than retried.
+
+        Returns:
+            int: Number of cache rows updated
+        """
+        with self._hit_lock:
+            if self._hit_flush_timer is not None:
+                self._hit_flush_timer.cancel()
+                self._hit_flush_timer = None
+            pending = list(self._hit_buffer.items())
+            self._hit_buffer.clear()
+
+        if not pending:
+            return 0
+
+        try:
+            with self.db.engine.begin() as conn:
+                for start in range(0, len(pending), HIT_FLUSH_CHUNK_SIZE):
+                    chunk = pending[start:start + HIT_FLUSH_CHUNK_SIZE]
+                    rows = ', '.join(
+                        f"(:commodity_{i}, :query_date_{i}, :timeframe_{i}, :hits_{i})"
+                        for i in range(len(chunk))
+                    )
+                    params = {}
+                    for i, ((commodity, query_date, timeframe), hits) in enumerate(chunk):
+                        params.update({
+                            f'commodity_{i}': commodity,
+                            f'query_date_{i}': query_date,
+                            f'timeframe_{i}': timeframe,
+                            f'hits_{i}': hits
+                        })
+
+                    update_query = f"""
+                    UPDATE cache
+                    SET Cache_Hit_Count = cache.Cache_Hit_Count + src.Hits
+                    FROM AI_Query_Cache AS cache
+                    JOIN (VALUES {rows}) AS src (Commodity, Query_Date, Timeframe, Hits)
+                        ON cache.Commodity = src.Commodity
+                        AND cache.Query_Date = src.Query_Date
+                        AND cache.Timeframe = src.Timeframe
+                    """
+                    conn.execute(text(update_query), params)
+
+            logger.debug(f"Flushed cache hit counts for {len(pending)} query cache rows")
+            return len(pending)
+
+        except Exception as e:
+            logger.warning(f"Failed to flush cache hit counts: {e}")
+            return 0
+
     def get_cached_result_by_date(self, commodity: str, timeframe: str,
                                   query_date: datetime.date) -> Optional[Dict]:
         """
@@ -252,52 +490,17 @@ class AIDatabase:
         try:
             commodity = self._sanitize_commodity_name(commodity)
 
-            query = """
-            SELECT Query_Response, Created_At
-            FROM AI_Query_Cache
-            WHERE Commodity = :commodity
-                AND Query_Date = :query_date
-                AND Timeframe = :timeframe
-                AND Expires_At > GETDATE()
-            """
-
-            result = self.db.execute_query(
-                query,
-                {
-                    'commodity': commodity,
-                    'query_date': query_date,
-                    'timeframe': timeframe
-                }
-            )
+            row = self._fetch_cached_row(commodity, query_date, timeframe)
 
-            if not result.empty and len(result) > 0:
-                response_json = result.iloc[0]['Query_Response']
-                created_at = result.iloc[0]['Created_At']
+            if row is not None:
+                response_json = row['Query_Response']
+                created_at = row['Created_At']
 
                 # Parse JSON response
-                response = json.loads(response_json)
+                response = _json_loads(response_json)
                 response['cached'] = True
                 response['cache_timestamp'] = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
 
-                # Update cache hit count
-                update_query = """
-                UPDATE AI_Query_Cache
-                SET Cache_Hit_Count = Cache_Hit_Count + 1
-                WHERE Commodity = :commodity
-                    AND Query_Date = :query_date
-                    AND Timeframe = :timeframe
-                """
-                with self.db.engine.connect() as conn:
-                    conn.execute(
-                        text(update_query),
-                        {
-                            'commodity': commodity,
-                            'query_date': query_date,
-                            'timeframe': timeframe
-                        }
-                    )
-                    conn.commit()
-
                 logger.info(f"Retrieved cached result for {commodity} from {query_date} ({timeframe})")
                 return response
 
@@ -329,54 +532,19 @@ class AIDatabase:
             commodity = self._sanitize_commodity_name(commodity)
             query_date = datetime.now().date()
 
-            query = """
-            SELECT Query_Response, Created_At, Query_Date
-            FROM AI_Query_Cache
-            WHERE Commodity = :commodity
-                AND Query_Date = :query_date
-                AND Timeframe = :timeframe
-                AND Expires_At > GETDATE()
-            """
-
-            result = self.db.execute_query(
-                query,
-                {
-                    'commodity': commodity,
-                    'query_date': query_date,
-                    'timeframe': timeframe
-                }
-            )
+            row = self._fetch_cached_row(commodity, query_date, timeframe)
 
-            if not result.empty and len(result) > 0:
-                response_json = result.iloc[0]['Query_Response']
-                created_at = result.iloc[0]['Created_At']
-                cached_query_date = result.iloc[0]['Query_Date']
+            if row is not None:
+                response_json = row['Query_Response']
+                created_at = row['Created_At']
+                cached_query_date = row['Query_Date']
 
                 # Parse JSON response
-                response = json.loads(response_json)
+                response = _json_loads(response_json)
                 response['cached'] = True
                 response['cache_timestamp'] = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
                 response['cache_date'] = cached_query_date.isoformat() if hasattr(cached_query_date, 'isoformat') else str(cached_query_date)
 
-                # Update cache hit count
-                update_query = """
-                UPDATE AI_Query_Cache
-                SET Cache_Hit_Count = Cache_Hit_Count + 1
-                WHERE Commodity = :commodity
-                    AND Query_Date = :query_date
-                    AND Timeframe = :timeframe
-                """
-                with self.db.engine.connect() as conn:
-                    conn.execute(
-                        text(update_query),
-                        {
-                            'commodity': commodity,
-                            'query_date': query_date,
-                            'timeframe': timeframe
-                        }
-                    )
-                    conn.commit()
-
                 logger.info(f"Retrieved cached result for {commodity} ({timeframe})")
                 return response
 
@@ -407,7 +575,7 @@ class AIDatabase:
 
             # Extract data fields
             trend = data.get('trend', 'unknown')
-            key_drivers = json.dumps(data.get('key_drivers', []))
+            key_drivers = _json_dumps(data.get('key_drivers', []))
 
             # Extract price information
             price_str = data.get('current_price', '')
@@ -415,9 +583,8 @@ class AIDatabase:
             price_unit = None
             if price_str:
                 # Parse price like "USD 105.30/ton" or "$430/ton"
-                import re
-                price_match = re.search(r'[\$]?\s*([\d,]+\.?\d*)', price_str)
-                unit_match = re.search(r'/(\w+)', price_str)
+                price_match = _PRICE_RE.search(price_str)
+                unit_match = _PRICE_UNIT_RE.search(price_str)
                 if price_match:
                     current_price = float(price_match.group(1).replace(',', ''))
                 if unit_match:
@@ -427,27 +594,25 @@ class AIDatabase:
             price_change_str = data.get('price_change', '')
             price_change_pct = None
             if price_change_str:
-                change_match = re.search(r'([+-]?\d+\.?\d*)%', price_change_str)
+                change_match = _PRICE_CHANGE_PCT_RE.search(price_change_str)
                 if change_match:
                     price_change_pct = float(change_match.group(1))
 
             confidence_score = data.get('confidence_score', data.get('sentiment_score', 0.0))
 
             # Insert or update intelligence using correct column names
-            merge_query = """
-            MERGE AI_Market_Intelligence AS target
-            USING (SELECT :commodity AS Commodity, :analysis_date AS Analysis_Date) AS source
-            ON target.Commodity = source.Commodity AND target.Analysis_Date = source.Analysis_Date
-            WHEN MATCHED THEN
-                UPDATE SET
-                    Trend = :trend,
-                    Key_Drivers = :key_drivers,
-                    Current_Price = :current_price,
-                    Price_Unit = :price_unit,
-                    Price_Change_Pct = :price_change_pct,
-                    Confidence_Score = :confidence_score
-            WHEN NOT MATCHED THEN
-                INSERT (Commodity, Analysis_Date, Trend, Key_Drivers,
+            upsert_query = """
+            UPDATE AI_Market_Intelligence WITH (UPDLOCK, SERIALIZABLE)
+            SET Trend = :trend,
+                Key_Drivers = :key_drivers,
+                Current_Price = :current_price,
+                Price_Unit = :price_unit,
+                Price_Change_Pct = :price_change_pct,
+                Confidence_Score = :confidence_score
+            WHERE Commodity = :commodity AND Analysis_Date = :analysis_date;
+
+            IF @@ROWCOUNT = 0
+                INSERT INTO AI_Market_Intelligence (Commodity, Analysis_Date, Trend, Key_Drivers,
                        Current_Price, Price_Unit, Price_Change_Pct, Confidence_Score)
                 VALUES (:commodity, :analysis_date, :trend, :key_drivers,
                        :current_price, :price_unit, :price_change_pct, :confidence_score);
@@ -455,7 +620,7 @@ class AIDatabase:
 
             with self.db.engine.connect() as conn:
                 conn.execute(
-                    text(merge_query),
+                    text(upsert_query),
                     {
                         'commodity': commodity,
                         'analysis_date': analysis_date,
@@ -499,44 +664,45 @@ class AIDatabase:
             commodity = self._sanitize_commodity_name(commodity)
             news_date = datetime.now().date()
 
-            # Delete old news items for this commodity (keep last 50)
+            # Delete old news items for this commodity (keep last 50); rows are
+            # ranked in one scan and deleted through the CTE
             delete_query = """
-            DELETE FROM AI_News_Items
-            WHERE Commodity = :commodity
-                AND News_ID NOT IN (
-                    SELECT TOP 50 News_ID
-                    FROM AI_News_Items
-                    WHERE Commodity = :commodity
-                    ORDER BY News_Date DESC, News_ID DESC
-                )
+            WITH ranked AS (
+                SELECT ROW_NUMBER() OVER (ORDER BY News_Date DESC, News_ID DESC) AS rn
+                FROM AI_News_Items
+                WHERE Commodity = :commodity
+            )
+            DELETE FROM ranked
+            WHERE rn > 50
             """
 
             with self.db.engine.connect() as conn:
                 conn.execute(text(delete_query), {'commodity': commodity})
 
-                # Insert new news items using correct column names
-                for item in news_items[:20]:  # Limit to 20 most recent
+                # Insert new news items using correct column names, all rows in one
+                # multi-row VALUES statement (one round-trip on pymssql and pyodbc)
+                rows = []
+                params = {'commodity': commodity, 'news_date': news_date}
+                for i, item in enumerate(news_items[:20]):  # Limit to 20 most recent
                     # Extract source URLs
                     sources = item.get('sources', [])
-                    source_urls = json.dumps(sources) if sources else '[]'
-
-                    insert_query = """
-                    INSERT INTO AI_News_Items
-                    (Commodity, News_Date, Headline, Summary, Source_URLs, Sentiment)
-                    VALUES (:commodity, :news_date, :headline, :summary, :source_urls, :sentiment)
-                    """
-
-                    conn.execute(
-                        text(insert_query),
-                        {
-                            'commodity': commodity,
-                            'news_date': news_date,
-                            'headline': item.get('title', '')[:500],
-                            'summary': item.get('content', item.get('summary', ''))[:1000],
-                            'source_urls': source_urls,
-                            'sentiment': item.get('sentiment', 'neutral')[:20]
-                        }
+                    rows.append(
+                        f"(:commodity, :news_date, :headline_{i}, :summary_{i}, "
+                        f":source_urls_{i}, :sentiment_{i})"
                     )
+                    params.update({
+                        f'headline_{i}': item.get('title', '')[:500],
+                        f'summary_{i}': item.get('content', item.get('summary', ''))[:1000],
+                        f'source_urls_{i}': _json_dumps(sources) if sources else '[]',
+                        f'sentiment_{i}': item.get('sentiment', 'neutral')[:20]
+                    })
+
+                insert_query = f"""
+                INSERT INTO AI_News_Items
+                (Commodity, News_Date, Headline, Summary, Source_URLs, Sentiment)
+                VALUES {', '.join(rows)}
+                """
+                conn.execute(text(insert_query), params)
 
                 conn.commit()
 
@@ -640,24 +806,11 @@ class AIDatabase:
                 news_by_commodity[commodity] = []
 
             if not result_df.empty:
-                for _, row in result_df.iterrows():
-                    # Parse source URLs if JSON
-                    source_urls = row['Source_URLs']
-                    if isinstance(source_urls, str):
-                        try:
-                            source_urls = json.loads(source_urls)
-                        except:
-                            source_urls = [source_urls] if source_urls else []
-
-                    news_item = {
-                        'headline': row['Headline'],
-                        'summary': row['Summary'],
-                        'sources': source_urls,
-                        'date': row['News_Date'].isoformat() if hasattr(row['News_Date'], 'isoformat') else str(row['News_Date']),
-                        'sentiment': row['Sentiment']
-                    }
-
-                    news_by_commodity[row['Commodity']].append(news_item)
+                # Rows come back with sanitized names; map them to the caller's names
+                for commodity, news_item in zip(
+                    result_df['Commodity'].tolist(), _news_items_from_frame(result_df)
+                ):
+                    news_by_commodity[sanitized_map.get(commodity, commodity)].append(news_item)
 
             # Log summary
             total_news = sum(len(news) for news in news_by_commodity.values())
@@ -703,23 +856,7 @@ class AIDatabase:
                 'cutoff_date': cutoff_date
             })
 
-            news_items = []
-            for _, row in result_df.iterrows():
-                # Parse source URLs if JSON
-                source_urls = row['Source_URLs']
-                if isinstance(source_urls, str):
-                    try:
-                        source_urls = json.loads(source_urls)
-                    except:
-                        source_urls = [source_urls] if source_urls else []
-
-                news_items.append({
-                    'headline': row['Headline'],
-                    'summary': row['Summary'],
-                    'sources': source_urls,
-                    'date': row['News_Date'].isoformat() if hasattr(row['News_Date'], 'isoformat') else str(row['News_Date']),
-                    'sentiment': row['Sentiment']
-                })
+            news_items = _news_items_from_frame(result_df)
 
             # Only log if news items found (reduce log noise)
             if news_items:
@@ -766,24 +903,10 @@ class AIDatabase:
 
             if not result_df.empty:
                 row = result_df.iloc[0]
-
-                # Parse key drivers if JSON
-                key_drivers = row['Key_Drivers']
-                if isinstance(key_drivers, str):
-                    try:
-                        key_drivers = json.loads(key_drivers)
-                    except:
-                        # Try splitting by semicolon if not JSON
-                        key_drivers = [d.strip() for d in key_drivers.split(';')] if key_drivers else []
-
-                return {
-                    'current_price': row['Current_Price'],
-                    'price_change': f"{row['Price_Change_Pct']:.1f}%" if pd.notna(row['Price_Change_Pct']) else 'N/A',
-                    'trend': row['Trend'] if pd.notna(row['Trend']) else 'unknown',
-                    'key_drivers': key_drivers if key_drivers else [],
-                    'price_outlook': '',  # Column doesn't exist in table
-                    'analysis_date': row['Analysis_Date'].isoformat() if hasattr(row['Analysis_Date'], 'isoformat') else str(row['Analysis_Date'])
-                }
+                return _intelligence_from_row(
+                    row['Current_Price'], row['Price_Change_Pct'], row['Trend'],
+                    row['Key_Drivers'], row['Analysis_Date']
+                )
 
             return None
 
@@ -795,6 +918,85 @@ class AIDatabase:
             logger.error(f"Failed to get historical market intelligence for {commodity}: {e}")
             return None
 
+    def get_historical_market_intelligence_batch(self, commodities: List[str], days: int = 7) -> Dict[str, Dict]:
+        """
+        Batch load the most recent market intelligence for multiple commodities
+        in a single query. Much faster than calling
+        get_historical_market_intelligence() for each commodity.
+
+        Args:
+            commodities: List of commodity names
+            days: Number of days to look back (default 7)
+
+        Returns:
+            Dictionary mapping commodity name to market intelligence data
+            (commodities without data in the window are omitted)
+        """
+        if not commodities:
+            return {}
+
+        try:
+            cutoff_date = datetime.now().date() - timedelta(days=days)
+
+            # Sanitize commodity names - skip invalid ones instead of failing completely
+            sanitized_map = {}  # Map sanitized -> original
+            for c in commodities:
+                try:
+                    sanitized_map[self._sanitize_commodity_name(c)] = c
+                except ValueError as e:
+                    logger.warning(f"Skipping invalid commodity name '{c}': {e}")
+
+            if not sanitized_map:
+                logger.warning("No valid commodity names after sanitization")
+                return {}
+
+            # Build IN clause for SQL
+            placeholders = ', '.join([f':commodity_{i}' for i in range(len(sanitized_map))])
+            params = {f'commodity_{i}': name for i, name in enumerate(sanitized_map)}
+            params['cutoff_date'] = cutoff_date
+
+            # Latest row per commodity (same order as the TOP 1 in the single version)
+            query = f"""
+            WITH latest AS (
+                SELECT
+                    Commodity,
+                    Current_Price,
+                    Price_Change_Pct,
+                    Trend,
+                    Key_Drivers,
+                    Analysis_Date,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY Commodity
+                        ORDER BY Analysis_Date DESC, Created_At DESC
+                    ) AS rn
+                FROM AI_Market_Intelligence
+                WHERE Commodity IN ({placeholders})
+                  AND Analysis_Date >= :cutoff_date
+            )
+            SELECT Commodity, Current_Price, Price_Change_Pct, Trend, Key_Drivers, Analysis_Date
+            FROM latest
+            WHERE rn = 1
+            """
+
+            result_df = self.db.execute_query(query, params)
+
+            intelligence_by_commodity = {}
+            for commodity, *fields in zip(
+                result_df['Commodity'].tolist(),
+                result_df['Current_Price'].tolist(),
+                result_df['Price_Change_Pct'].tolist(),
+                result_df['Trend'].tolist(),
+                result_df['Key_Drivers'].tolist(),
+                result_df['Analysis_Date'].tolist()
+            ):
+                intelligence_by_commodity[sanitized_map.get(commodity, commodity)] = _intelligence_from_row(*fields)
+
+            return intelligence_by_commodity
+
+        except Exception as e:
+            logger.error(f"Failed to batch load market intelligence: {e}")
+            return {}
+
     def get_recent_news(self, commodity: Optional[str] = None, limit: int = 10) -> pd.DataFrame:
         """
         Get recent news items
@@ -878,26 +1080,11 @@ class AIDatabase:
 
             if not result_df.empty:
                 row = result_df.iloc[0]
-                response = json.loads(row['Query_Response']) if row['Query_Response'] else {}
+                response = _json_loads(row['Query_Response']) if row['Query_Response'] else {}
 
-                # Update cache hit count
-                update_query = """
-                UPDATE AI_Query_Cache
-                SET Cache_Hit_Count = Cache_Hit_Count + 1
-                WHERE Commodity = :commodity
-                    AND Query_Date = :query_date
-                    AND Timeframe = :timeframe
-                """
-                with self.db.engine.connect() as conn:
-                    conn.execute(
-                        text(update_query),
-                        {
-                            'commodity': commodity,
-                            'query_date': row['Query_Date'],
-                            'timeframe': timeframe
-                        }
-                    )
-                    conn.commit()
+                # Count the hit (flushed in the background, see flush_hit_counts)
+                if self.has_write_access:
+                    self._record_hit(commodity, row['Query_Date'], timeframe)
 
                 logger.info(f"Retrieved cached result for {commodity} from {row['Query_Date']} ({timeframe})")
 
@@ -943,7 +1130,7 @@ class AIDatabase:
             result_df = self.db.execute_query(query, {'today': today, 'timeframe': timeframe})
 
             for _, row in result_df.iterrows():
-                response = json.loads(row['Query_Response']) if row['Query_Response'] else {}
+                response = _json_loads(row['Query_Response']) if row['Query_Response'] else {}
 
                 results.append({
                     "success": True,
@@ -977,19 +1164,32 @@ class AIDatabase:
             logger.warning("No write access - cannot save query results")
             return False
 
+        self.flush_hit_counts()
         success = True
+
+        # Upsert every cache row in one transaction instead of one round-trip per result
+        cache_params = []
         for result in results:
             if result.get("success"):
-                # Save each result
-                if not self.save_query_result(
-                    result.get("commodity"),
-                    "full",  # query_type
-                    timeframe,
-                    result,
-                    query_date  # Pass the query_date parameter
-                ):
+                try:
+                    cache_params.append(self._query_cache_params(
+                        result.get("commodity"), timeframe, result, query_date
+                    ))
+                except ValueError as e:
+                    logger.error(f"Failed to save query result: {e}")
                     success = False
 
+        if cache_params:
+            try:
+                with self.db.engine.begin() as conn:
+                    conn.execute(text(QUERY_CACHE_UPSERT), cache_params)
+                logger.info(f"Saved {len(cache_params)} query results ({timeframe})")
+            except Exception as e:
+                logger.error(f"Failed to save query results: {e}")
+                success = False
+
+        for result in results:
+            if result.get("success"):
                 # Also save market intelligence if present
                 if result.get("data"):
                     self.save_market_intelligence(
@@ -1048,8 +1248,7 @@ class AIDatabase:
                                 headline = processor.extract_headline(news_text, max_length=100)
 
                                 # Extract the main content (removing date prefix if present)
-                                import re
-                                date_match = re.match(r'^(\w+ \d+):\s*(.+)', news_text)
+                                date_match = _NEWS_DATE_PREFIX_RE.match(news_text)
                                 if date_match:
                                     news_content = date_match.group(2)
                                 else:
@@ -3,7 +3,7 @@ Commodity Query Orchestration Module
 Manages and schedules Perplexity AI queries for various commodities
 """
 
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Callable
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass, field
@@ -18,6 +18,9 @@ from ..data_loader import get_commodity_metadata
 # Get logger (don't call basicConfig - let main.py configure it)
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight Perplexity requests (the shared rate limiter still applies)
+MAX_CONCURRENT_QUERIES = 8
+
 @dataclass
 class Commodity:
     """Commodity configuration"""
@@ -137,13 +140,46 @@ class CommodityQueryOrchestrator:
             timeframe
         )
     
+    async def _query_commodities_concurrently(
+        self,
+        commodities: List[Commodity],
+        timeframe: TimeFrame,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List:
+        """
+        Query a list of commodities concurrently, bounded by MAX_CONCURRENT_QUERIES
+
+        Returns results in the same order as the input; failed queries are
+        returned as exceptions for the caller to handle. If given,
+        progress_callback(done, total) is called as each query finishes.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        total = len(commodities)
+        done = 0
+
+        async def _bounded_query(commodity: Commodity) -> Dict:
+            nonlocal done
+            try:
+                async with semaphore:
+                    return await self._query_commodity_async(commodity, timeframe)
+            finally:
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+
+        return await asyncio.gather(
+            *(_bounded_query(c) for c in commodities),
+            return_exceptions=True
+        )
+
     def query_all_commodities(
         self,
         timeframe: TimeFrame = "1 week",
         force_refresh: bool = False,
         commodity_zscores: Optional[Dict[str, float]] = None,
         selected_commodities: Optional[List[str]] = None,
-        data_last_updated: Optional[datetime] = None
+        data_last_updated: Optional[datetime] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> List[Dict]:
         """
         Query all commodities with proper caching and z-score filtering
@@ -162,6 +198,7 @@ class CommodityQueryOrchestrator:
             commodity_zscores: Dict of commodity names to z-scores for API query filtering
             selected_commodities: Optional list of commodity names to query (if None, query all)
             data_last_updated: Last updated date of the commodity data (uses current date if None)
+            progress_callback: Optional callable(done, total) invoked as each Perplexity query completes
 
         Returns:
             List of query results including all cached data from past 7 days
@@ -170,24 +207,29 @@ class CommodityQueryOrchestrator:
         cache_date = data_last_updated.date() if data_last_updated else datetime.now().date()
         today = datetime.now().date()
 
-        # Filter commodities based on selection
+        # Filter commodities based on selection (set gives O(1) membership checks)
+        selected_set = set(selected_commodities) if selected_commodities else None
         commodities_to_process = self.commodities
-        if selected_commodities:
+        if selected_set:
             commodities_to_process = [
                 c for c in self.commodities
-                if c.display_name in selected_commodities
+                if c.display_name in selected_set
             ]
             logger.info(f"Processing {len(commodities_to_process)} selected commodities out of {len(self.commodities)}")
 
+        # A forced refresh must reach the API, not the client's response memo
+        if force_refresh:
+            self.client.clear_response_cache()
+
         # Step 1: Check daily memory cache (only if not force_refresh)
         # Use data's last updated date for cache key
         if not force_refresh and self.cache_date == cache_date and timeframe in self.daily_cache:
             # Filter cached results if specific commodities selected
-            if selected_commodities:
+            if selected_set:
                 cached_results = [
                     r for r in self.daily_cache[timeframe]
-                    if r.get('display_name') in selected_commodities or
-                       r.get('data', {}).get('display_name') in selected_commodities
+                    if r.get('display_name') in selected_set or
+                       r.get('data', {}).get('display_name') in selected_set
                 ]
                 return cached_results
             logger.info(f"Using daily memory cache for {timeframe}")
@@ -203,6 +245,7 @@ class CommodityQueryOrchestrator:
             # Batch load news for all commodities at once (much faster than individual queries)
             commodity_names = [c.name for c in commodities_to_process]
             batch_news = self.database.get_all_weekly_news_batch(commodity_names, days=7)
+            batch_intelligence = self.database.get_historical_market_intelligence_batch(commodity_names, days=7)
 
             # Track invalid commodities to log summary
             invalid_commodities = []
@@ -225,9 +268,9 @@ class CommodityQueryOrchestrator:
                         results.append(cached_result)
                         existing_commodities.add(commodity.name)
                     else:
-                        # Get news from batch load (already loaded above)
+                        # Get news and intelligence from batch load (already loaded above)
                         weekly_news = batch_news.get(commodity.name, [])
-                        historical_intelligence = self.database.get_historical_market_intelligence(commodity.name, days=7)
+                        historical_intelligence = batch_intelligence.get(commodity.name)
 
                         if weekly_news or historical_intelligence:
                             # Create a result from historical data (don't log each one - will log summary at end)
@@ -360,9 +403,22 @@ class CommodityQueryOrchestrator:
             else:
                 logger.info(f"Querying {len(commodities_to_query)} commodities from Perplexity AI")
 
-                for commodity in commodities_to_query:
-                    # Query Perplexity AI
-                    result = self._query_commodity_with_context(commodity, timeframe)
+                # Query Perplexity AI concurrently instead of one commodity at a time
+                responses = asyncio.run(
+                    self._query_commodities_concurrently(
+                        commodities_to_query, timeframe, progress_callback
+                    )
+                )
+
+                fresh_results = []
+                for commodity, result in zip(commodities_to_query, responses):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error querying {commodity.name}: {result}")
+                        result = {
+                            "success": False,
+                            "commodity": commodity.name,
+                            "error": str(result)
+                        }
 
                     # Add z-score info
                     if commodity_zscores and result.get("success"):
@@ -371,15 +427,16 @@ class CommodityQueryOrchestrator:
                         result['data']['below_threshold'] = abs(zscore) <= self.zscore_threshold
 
                     results.append(result)
+                    if result.get("success"):
+                        fresh_results.append(result)
 
-                    # Save to database immediately with data's last updated date
-                    if self.database and result.get("success"):
-                        save_success = self.database.save_query_results(
-                            [result], timeframe, query_date=cache_date
-                        ) if hasattr(self.database, 'save_query_results') else \
-                            self.database.save_query_results([result], timeframe)
-                        if save_success:
-                            logger.info(f"Saved {commodity.name} to database with date {cache_date}")
+                # Save all fresh results in one batch with data's last updated date
+                if self.database and fresh_results:
+                    save_success = self.database.save_query_results(
+                        fresh_results, timeframe, query_date=cache_date
+                    )
+                    if save_success:
+                        logger.info(f"Saved {len(fresh_results)} fresh results to database with date {cache_date}")
 
         # Step 4: Enhance with additional weekly news if needed
         if self.database:
@@ -503,6 +560,9 @@ class CommodityQueryOrchestrator:
                 "error": f"Commodity {commodity_name} not found"
             }
         
+        if force_refresh:
+            self.client.clear_response_cache()
+
         # Check database first unless force_refresh
         if self.database and not force_refresh:
             db_result = self.database.get_today_results(commodity_name, timeframe)
@@ -4,6 +4,9 @@ Perplexity AI Client for Commodity Data Retrieval
 
 import os
 import json
+import time
+import hashlib
+import threading
 import logging
 from typing import Dict, List, Optional, Literal
 from datetime import datetime
@@ -29,6 +32,9 @@ logger = logging.getLogger(__name__)
 
 TimeFrame = Literal["1 week", "1 month"]
 
+# Successful API responses are reused for identical requests within this window
+RESPONSE_CACHE_TTL_SECONDS = 6 * 3600
+
 class PerplexityClient:
     """Client for interacting with Perplexity AI API"""
     
@@ -62,6 +68,13 @@ class PerplexityClient:
         
         # Initialize rate limiter
         self.rate_limiter = get_perplexity_rate_limiter()
+
+        # In-process memo of raw responses keyed by a digest of the request payload.
+        # The client is shared across reruns (st.cache_resource), so repeated
+        # identical prompts skip the paid API even when the database cache is
+        # read-only or the save failed.
+        self._response_cache: Dict[str, tuple] = {}
+        self._response_cache_lock = threading.Lock()
     
     def query_commodity(
         self,
@@ -228,10 +241,6 @@ Critical instructions:
     def _make_request(self, prompt: str) -> Dict:
         """Make API request to Perplexity with rate limiting"""
         
-        # Wait for rate limit clearance
-        if not self.rate_limiter.wait_if_needed(timeout=30):
-            raise TimeoutError("Rate limit timeout - too many requests")
-        
         # Perplexity model names - see https://docs.perplexity.ai/getting-started/models
         # Available online models: "sonar", "sonar-online"
         
@@ -256,6 +265,18 @@ Critical instructions:
             "temperature": 0.2,  # Lower temperature for more factual responses
             "max_tokens": 4000  # Add max_tokens which may be required
         }
+
+        cache_key = hashlib.blake2b(
+            json.dumps(payload, sort_keys=True).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached Perplexity response for identical request")
+            return cached
+
+        # Wait for rate limit clearance
+        if not self.rate_limiter.wait_if_needed(timeout=30):
+            raise TimeoutError("Rate limit timeout - too many requests")
         
         # ⚠️ HOTFIX: SSL verification disabled for testing
         # TODO: REMOVE verify=False FOR PRODUCTION - This is insecure!
@@ -275,7 +296,36 @@ Critical instructions:
             logger.error(f"Response: {response.text}")
             
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        self._store_response(cache_key, data)
+        return data
+
+    def clear_response_cache(self) -> None:
+        """Drop all memoized responses (used when a refresh is forced)"""
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
+    def _get_cached_response(self, cache_key: str) -> Optional[Dict]:
+        """Return a memoized response for this request digest if still fresh"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(cache_key)
+            if entry is None:
+                return None
+            stored_at, data = entry
+            if time.monotonic() - stored_at > RESPONSE_CACHE_TTL_SECONDS:
+                del self._response_cache[cache_key]
+                return None
+            return data
+
+    def _store_response(self, cache_key: str, data: Dict) -> None:
+        """Memoize a successful response, dropping expired entries"""
+        now = time.monotonic()
+        with self._response_cache_lock:
+            expired = [key for key, (stored_at, _) in self._response_cache.items()
+                       if now - stored_at > RESPONSE_CACHE_TTL_SECONDS]
+            for key in expired:
+                del self._response_cache[key]
+            self._response_cache[cache_key] = (now, data)
     
     def _parse_response(
         self,
@@ -1,21 +1,57 @@
 import streamlit as st
 import pandas as pd
 import re
+import json
 from datetime import datetime
 import logging
 from st_aggrid import AgGrid, GridOptionsBuilder, JsCode
 
-from modules.ai_integration import (
-    TimeFrame,
-    CommodityQueryOrchestrator,
-    DataProcessor as AIDataProcessor,
-    AIDatabase
-)
-from modules.calculations import compute_frequency_aware_zscore
-from modules.config import DEFAULT_TIMEFRAME, AI_ZSCORE_THRESHOLD
+from modules.calculations import compute_latest_zscores
+from modules.utils.cache_stats import observed_cache
 
 logger = logging.getLogger(__name__)
 
+# Domain extraction for news card source links
+_DOMAIN_RE = re.compile(r'https?://(?:www\.)?([^/]+)')
+
+# Percentage extraction for the Price/Change column
+_PAREN_PERCENT_RE = re.compile(r'\(([-+]?\d+\.?\d*%?)\)')
+_PERCENT_RE = re.compile(r'[-+]?\d+\.?\d*%')
+
+# News card templates, filled with str.format per card
+_SOURCE_LINK_HTML = '<a href="{url}" target="_blank" style="color: #007bff; text-decoration: none;">{label}</a>'
+_SOURCE_SEPARATOR = ' | '
+_NEWS_CARD_HTML = """
+<div style='
+    background: white;
+    padding: 1.5rem;
+    border-radius: 8px;
+    border-left: 3px solid #00816D;
+    margin-bottom: 1rem;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+'>
+    <h4 style='color: #1e3d59; margin-bottom: 0.5rem;'>{title}</h4>
+    <div style='color: #333; line-height: 1.8; margin-bottom: 1rem;'>{content}</div>
+    <p style='color: #007bff; font-size: 0.9rem; margin-top: 1rem;'>📰 Sources: {sources}</p>
+    <small style='color: #6c757d;'>Updated: {date}</small>
+</div>
+"""
+
+
+@observed_cache(st.cache_data(ttl=3600, show_spinner=False))
+def _process_cached(_ai_processor, results_json: str):
+    """
+    Memoize processor output across reruns.
+
+    Keyed on the serialized results only; the processor is stateless and is
+    excluded from hashing via the leading underscore.
+    """
+    table_data, news_cards = _ai_processor.process_query_results(json.loads(results_json))
+    # Pre-render card bodies once so reruns don't redo the newline conversion
+    for card in news_cards:
+        card['content_html'] = card.get('content', '').replace('\n', '<br>')
+    return table_data, news_cards
+
 
 @st.fragment
 def render_ai_intelligence_section(
@@ -42,28 +78,20 @@ def render_ai_intelligence_section(
         # Get unique commodities from the filtered dataframe
         filtered_commodities = list(analysis_df['Commodities'].dropna().unique())
 
-        # Calculate proper z-scores using historical price data
-        for commodity in filtered_commodities:
-            if commodity and pd.notna(commodity):
-                # Get historical price series for this commodity
-                commodity_data = df_data[df_data['Commodities'] == commodity].copy()
-                if not commodity_data.empty:
-                    # Create price series indexed by date
-                    price_series = commodity_data.set_index('Date')['Price']
-                    price_series.name = commodity
-
-                    # Use frequency-aware z-score calculation with proper volatility
-                    zscore_df = compute_frequency_aware_zscore(
-                        price_series,
-                        lookback=90,  # 90 days lookback for frequency detection
-                        window=30     # 30 periods rolling window for stats
-                    )
-
-                    if not zscore_df.empty and 'ZScore' in zscore_df.columns:
-                        # Get the most recent z-score
-                        latest_zscore = zscore_df['ZScore'].iloc[-1]
-                        if pd.notna(latest_zscore):
-                            commodity_zscores[commodity] = float(latest_zscore)
+        # Latest frequency-aware z-score per commodity (90-day frequency
+        # lookback, 30-period rolling window), computed in one grouped pass
+        latest_zscores = compute_latest_zscores(
+            df_data,
+            tuple(c for c in filtered_commodities if c),
+            window=30,
+            frequency_aware=True,
+            lookback=90
+        )
+        latest_zscores = latest_zscores[latest_zscores['ZScore'].notna()]
+        commodity_zscores = dict(zip(
+            latest_zscores['Commodity'],
+            latest_zscores['ZScore'].astype(float).tolist()
+        ))
 
     # Get cached or fresh AI data
     ai_results = None
@@ -76,19 +104,32 @@ def render_ai_intelligence_section(
             # If selected_ai_commodities is provided and not empty, use it; otherwise use filtered commodities
             commodities_to_query = selected_ai_commodities if selected_ai_commodities else filtered_commodities
 
+            # Report live progress while uncached commodities are queried
+            progress_placeholder = st.empty()
+
+            def _on_query_progress(done, total):
+                progress_placeholder.progress(
+                    done / total,
+                    text=f"Queried {done}/{total} commodities"
+                )
+
             ai_results = ai_orchestrator.query_all_commodities(
                 timeframe=ai_timeframe,
                 force_refresh=force_refresh,
                 commodity_zscores=commodity_zscores,
                 selected_commodities=commodities_to_query,
-                data_last_updated=data_last_updated
+                data_last_updated=data_last_updated,
+                progress_callback=_on_query_progress
             )
+            progress_placeholder.empty()
 
             if ai_results:
                 # Process results with weekly aggregation already done in orchestrator
-                ai_table_data, ai_news_cards = ai_processor.process_query_results(ai_results)
+                ai_table_data, ai_news_cards = _process_cached(
+                    ai_processor,
+                    json.dumps(ai_results, sort_keys=True, default=str)
+                )
                 st.session_state.ai_last_update = datetime.now()
-                st.session_state.ai_refresh = False
 
                 # Log statistics about API usage
                 total_commodities = len(ai_results)
@@ -129,12 +170,16 @@ def render_ai_intelligence_section(
         if ai_results:
             col1, col2, col3 = st.columns(3)
 
-            bullish_count = sum(1 for r in ai_results
-                               if r.get('data', {}).get('trend') == 'bullish')
-            bearish_count = sum(1 for r in ai_results
-                               if r.get('data', {}).get('trend') == 'bearish')
-            stable_count = sum(1 for r in ai_results
-                              if r.get('data', {}).get('trend') == 'stable')
+            # Count trends in a single pass over the results
+            bullish_count = bearish_count = stable_count = 0
+            for r in ai_results:
+                trend = r.get('data', {}).get('trend')
+                if trend == 'bullish':
+                    bullish_count += 1
+                elif trend == 'bearish':
+                    bearish_count += 1
+                elif trend == 'stable':
+                    stable_count += 1
 
             with col1:
                 st.metric("📈 Bullish Markets", bullish_count)
@@ -154,8 +199,7 @@ def render_ai_intelligence_section(
                     if pd.isna(price_text) or price_text == 'N/A':
                         return 'N/A'
                     # Extract percentage from format like "↑ $1,234 (+5.2%)"
-                    import re
-                    match = re.search(r'\(([-+]?\d+\.?\d*%?)\)', str(price_text))
+                    match = _PAREN_PERCENT_RE.search(str(price_text))
                     if match:
                         percent = match.group(1)
                         # Add % if not present
@@ -169,7 +213,7 @@ def render_ai_intelligence_section(
                         else:
                             return percent
                     # If no parentheses, look for standalone percentage
-                    match = re.search(r'[-+]?\d+\.?\d*%', str(price_text))
+                    match = _PERCENT_RE.search(str(price_text))
                     if match:
                         return match.group(0)
                     return price_text
@@ -469,60 +513,58 @@ def render_ai_intelligence_section(
 
             # Create columns for news cards
             cols = st.columns(2)
+            # Collect card HTML per column so each column is emitted in one call
+            col_html = {0: [], 1: []}
+            # Fallback date for cards without a timestamp, computed once per render
+            today_str = datetime.now().strftime('%Y-%m-%d')
 
             for idx, card in enumerate(ai_news_cards):  # Show all news cards
-                col_idx = idx % 2
-                with cols[col_idx]:
-                    # Format sources as clickable links
-                    source_links_html = []
-                    sources = card.get('sources', [])
-                    for source in sources:  # Show all sources
-                        if source.startswith('http'):
-                            # Extract domain name for display
-                            match = re.search(r'https?://(?:www\.)?([^/]+)', source)
-                            if match:
-                                domain = match.group(1).split('.')[0].capitalize()
-                                source_links_html.append(f'<a href="{source}" target="_blank" style="color: #007bff; text-decoration: none;">{domain}</a>')
-                            else:
-                                source_links_html.append(f'<a href="{source}" target="_blank" style="color: #007bff; text-decoration: none;">Source</a>')
+                # Format sources as clickable links
+                source_links_html = []
+                sources = card.get('sources', [])
+                for source in sources:  # Show all sources
+                    if source.startswith('http'):
+                        # Extract domain name for display
+                        match = _DOMAIN_RE.match(source)
+                        if match:
+                            domain = match.group(1).split('.')[0].capitalize()
+                            source_links_html.append(_SOURCE_LINK_HTML.format(url=source, label=domain))
                         else:
-                            source_links_html.append(source)
-
-                    sources_display = ' | '.join(source_links_html) if source_links_html else 'Market data'
-
-                    # Create news card HTML with improved styling
-                    # Convert newlines to HTML line breaks for proper display
-                    # Display full content without truncation
-                    content_html = card.get('content', '').replace('\n', '<br>')
-
-                    # Format timestamp to YYYY-MM-DD
-                    timestamp = card.get('timestamp', '')
-                    if timestamp and timestamp != '':
-                        try:
-                            # Parse ISO format timestamp and format to YYYY-MM-DD
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                            formatted_date = dt.strftime('%Y-%m-%d')
-                        except:
-                            formatted_date = timestamp
+                            source_links_html.append(_SOURCE_LINK_HTML.format(url=source, label='Source'))
                     else:
-                        formatted_date = datetime.now().strftime('%Y-%m-%d')
-
-                    card_html = f"""
-                    <div style='
-                        background: white;
-                        padding: 1.5rem;
-                        border-radius: 8px;
-                        border-left: 3px solid #00816D;
-                        margin-bottom: 1rem;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    '>
-                        <h4 style='color: #1e3d59; margin-bottom: 0.5rem;'>{card.get('title', 'Market Update')}</h4>
-                        <div style='color: #333; line-height: 1.8; margin-bottom: 1rem;'>{content_html}</div>
-                        <p style='color: #007bff; font-size: 0.9rem; margin-top: 1rem;'>📰 Sources: {sources_display}</p>
-                        <small style='color: #6c757d;'>Updated: {formatted_date}</small>
-                    </div>
-                    """
-                    st.markdown(card_html, unsafe_allow_html=True)
+                        source_links_html.append(source)
+
+                sources_display = _SOURCE_SEPARATOR.join(source_links_html) if source_links_html else 'Market data'
+
+                # Create news card HTML with improved styling
+                # Content is pre-converted to HTML line breaks in _process_cached
+                # Display full content without truncation
+                content_html = card['content_html']
+
+                # Format timestamp to YYYY-MM-DD
+                timestamp = card.get('timestamp', '')
+                if timestamp and timestamp != '':
+                    try:
+                        # Parse ISO format timestamp and format to YYYY-MM-DD
+                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                        formatted_date = dt.strftime('%Y-%m-%d')
+                    except:
+                        formatted_date = timestamp
+                else:
+                    formatted_date = today_str
+
+                card_html = _NEWS_CARD_HTML.format(
+                    title=card.get('title', 'Market Update'),
+                    content=content_html,
+                    sources=sources_display,
+                    date=formatted_date
+                )
+                col_html[idx % 2].append(card_html)
+
+            for col_idx, col in enumerate(cols):
+                if col_html[col_idx]:
+                    with col:
+                        st.markdown("".join(col_html[col_idx]), unsafe_allow_html=True)
 
         # Footer for AI section with dynamic source info
         # Get unique sectors from AI results
@@ -3,8 +3,25 @@ import pandas as pd
 import numpy as np
 from modules.query_builder import CommodityQueryBuilder
 from modules.constants import DataFreshnessConfig
+from modules.rolling_stats import rolling_mean_std, rolling_mean_std_array
+from modules.utils.cache_stats import observed_cache
 
-@st.cache_data(ttl=43200)  # Cache for 12 hours (43200 seconds)
+def frame_fingerprint(df: pd.DataFrame):
+    """
+    Cheap cache key for large DataFrames.
+
+    Hashing the full price history on every rerun costs more than a cache hit
+    saves, so use shape, columns and a hash of the first/last rows instead.
+    """
+    edges = pd.concat([df.head(5), df.tail(5)])
+    return (
+        df.shape,
+        tuple(df.columns),
+        int(pd.util.hash_pandas_object(edges, index=False).sum())
+    )
+
+
+@observed_cache(st.cache_data(ttl=43200, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint}))  # Cache for 12 hours (43200 seconds)
 def calculate_price_changes(df_data, df_list, selected_date):
     """
     Calculates price changes and key metrics based on a selected date.
@@ -81,11 +98,14 @@ def calculate_price_changes(df_data, df_list, selected_date):
     end_of_last_quarter = selected_date - pd.offsets.QuarterEnd(1)
     end_of_last_year = selected_date - pd.offsets.YearEnd(1)
 
+    # Sort the snapshot by date once; each cutoff is then a prefix found by binary search
+    snapshot_by_date = df_snapshot.sort_values('Date', kind='stable')
+
     def get_price_and_date_at(date_cutoff):
-        past_data = df_snapshot[df_snapshot['Date'] <= date_cutoff]
-        if past_data.empty:
+        end = snapshot_by_date['Date'].searchsorted(date_cutoff, side='right')
+        if end == 0:
             return pd.Series(dtype=float), pd.Series(dtype='datetime64[ns]')
-        past_data = past_data.sort_values('Date', ascending=False).drop_duplicates(subset='Commodities', keep='first').set_index('Commodities')
+        past_data = snapshot_by_date.iloc[:end].drop_duplicates(subset='Commodities', keep='last').set_index('Commodities')
         return past_data['Price'], past_data['Date']
 
     # --- Store historical prices and dates for debugging ---
@@ -108,11 +128,11 @@ def calculate_price_changes(df_data, df_list, selected_date):
     # --- Calculate New Metrics ---
     fifty_two_weeks_ago = selected_date - pd.DateOffset(weeks=52)
     df_52w = df_snapshot[df_snapshot['Date'] >= fifty_two_weeks_ago]
-    stats_52w = df_52w.groupby('Commodities')['Price'].agg(['max', 'min']).rename(columns={'max': '52W High', 'min': '52W Low'})
+    stats_52w = df_52w.groupby('Commodities', sort=False, observed=True)['Price'].agg(['max', 'min']).rename(columns={'max': '52W High', 'min': '52W Low'})
 
     thirty_days_ago = selected_date - pd.DateOffset(days=30)
     df_30d = df_snapshot[df_snapshot['Date'] >= thirty_days_ago]
-    avg_30d = df_30d.groupby('Commodities')['Price'].mean().rename('30D Avg')
+    avg_30d = df_30d.groupby('Commodities', sort=False, observed=True)['Price'].mean().rename('30D Avg')
     
     current_data['Change type'] = np.where(current_data['%Week'] > 0, 'Positive', np.where(current_data['%Week'] < 0, 'Negative', 'Neutral'))
 
@@ -246,8 +266,7 @@ def compute_frequency_aware_zscore(prices: pd.Series, lookback: int = 90, window
         returns = resampled.pct_change(fill_method=None)
 
     # Calculate rolling statistics on resampled data
-    rolling_mean = returns.rolling(window=window).mean()
-    rolling_std = returns.rolling(window=window).std()
+    rolling_mean, rolling_std = rolling_mean_std(returns, window)
 
     # Calculate Z-score (replace 0 with NaN to avoid division by zero)
     rolling_std_safe = rolling_std.replace(0, np.nan)
@@ -271,11 +290,7 @@ def compute_frequency_aware_zscore(prices: pd.Series, lookback: int = 90, window
         df["ZScore"] = zscore
 
     # Add flags for notable moves
-    df["Flag"] = df["ZScore"].apply(
-        lambda z: "extreme" if pd.notna(z) and abs(z) >= 3 else
-                  "notable" if pd.notna(z) and abs(z) >= 2 else
-                  "notice" if pd.notna(z) and abs(z) >= 1 else ""
-    )
+    df["Flag"] = flag_zscores(df["ZScore"])
 
     return df
 
@@ -300,10 +315,190 @@ def compute_zscore(prices: pd.Series, window: int = 30) -> pd.DataFrame:
     df["Return"] = df["Price"].pct_change(fill_method=None)
 
     # rolling mean & std of returns
-    df["RollingMean"] = df["Return"].rolling(window).mean()
-    df["RollingStd"] = df["Return"].rolling(window).std()
+    df["RollingMean"], df["RollingStd"] = rolling_mean_std(df["Return"], window)
 
     # avoid divide by zero
     df["ZScore"] = (df["Return"] - df["RollingMean"]) / df["RollingStd"].replace(0, pd.NA)
 
     return df
+
+
+@observed_cache(st.cache_data(ttl=43200, show_spinner=False))
+def compute_price_bands(commodity: str, window: int, data_last_updated, _prices: np.ndarray) -> dict:
+    """
+    Rolling moving average and standard deviation of a price series for the
+    price bands chart, cached per commodity, window and data load.
+
+    The price array is excluded from the cache key (leading underscore), so a
+    rerun hashes a name, an int and a timestamp instead of the whole series.
+    Band width (n standard deviations) is applied by the caller, so moving
+    the band slider reuses the cached statistics.
+
+    Args:
+        commodity (str): Commodity the prices belong to
+        window (int): Number of observations for the moving window
+        data_last_updated: Latest date of the loaded data (cache key)
+        _prices (np.ndarray): Date-sorted prices of the commodity (float32 or float64)
+
+    Returns:
+        dict: 'MA' and 'Std' float64 arrays aligned with _prices
+    """
+    moving_avg, moving_std = rolling_mean_std_array(_prices, window)
+    return {'MA': moving_avg, 'Std': moving_std}
+
+
+def flag_zscores(zscores) -> np.ndarray:
+    """
+    Vectorized z-score flags: "extreme" (|z| >= 3), "notable" (|z| >= 2),
+    "notice" (|z| >= 1), otherwise "" (including NaN).
+    """
+    abs_z = np.abs(np.asarray(zscores, dtype=float))
+    with np.errstate(invalid='ignore'):
+        return np.select(
+            [abs_z >= 3, abs_z >= 2, abs_z >= 1],
+            ['extreme', 'notable', 'notice'],
+            default=''
+        ).astype(object)
+
+
+def _segment_returns(values: np.ndarray, segment_start: np.ndarray) -> np.ndarray:
+    """pct_change(fill_method=None) within consecutive segments of a flat array."""
+    previous = np.empty_like(values)
+    previous[1:] = values[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = values / previous - 1
+    returns[segment_start] = np.nan
+    return returns
+
+
+def _zscore_from_stats(returns, rolling_mean, rolling_std):
+    """(return - mean) / std, with a zero std treated as undefined."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (returns - rolling_mean) / np.where(rolling_std == 0, np.nan, rolling_std)
+
+
+@observed_cache(st.cache_data(ttl=43200, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint}))
+def compute_latest_zscores(df_data: pd.DataFrame, commodities, window: int = 30,
+                           frequency_aware: bool = True, lookback: int = 90,
+                           daily_threshold: float = 0.5) -> pd.DataFrame:
+    """
+    Latest z-score row for many commodities in one vectorized pass.
+
+    Equivalent to running compute_frequency_aware_zscore (or, with
+    frequency_aware=False, detect_frequency + compute_zscore) on each
+    commodity's price series and keeping the last row, but works on the
+    whole long-format price table at once: commodities are laid out as
+    consecutive segments of one sorted array and the rolling statistics run
+    over all of them in one call (segments in parallel with numba; boundaries
+    also carry a NaN return, so no window crosses into the next commodity).
+
+    Args:
+        df_data (pd.DataFrame): Long price table with Commodities, Date, Price
+        commodities: Commodities to score; output follows this order
+        window (int): Number of observations for rolling statistics
+        frequency_aware (bool): Resample weekly commodities to W-FRI first
+        lookback (int): Days to look back for frequency detection
+        daily_threshold (float): Threshold for daily classification
+
+    Returns:
+        pd.DataFrame with columns Commodity, Frequency, Price, Return,
+        RollingMean, RollingStd, ZScore, Flag (commodities with fewer than
+        two price rows are skipped)
+    """
+    columns = ['Commodity', 'Frequency', 'Price', 'Return', 'RollingMean', 'RollingStd', 'ZScore', 'Flag']
+    order = pd.unique(pd.Series(list(commodities), dtype=object))
+
+    data = df_data.loc[df_data['Commodities'].isin(order), ['Commodities', 'Date', 'Price']]
+    data = data.sort_values(['Commodities', 'Date'], kind='stable')
+    sizes = data.groupby('Commodities', sort=False)['Date'].transform('size')
+    data = data[sizes.to_numpy() > 1]
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+
+    names = data['Commodities'].to_numpy()
+    dates = data['Date'].to_numpy(dtype='datetime64[ns]')
+    prices = data['Price'].to_numpy(dtype=np.float64)
+    n = len(prices)
+
+    segment_start = np.ones(n, dtype=bool)
+    segment_start[1:] = names[1:] != names[:-1]
+    group_ids = np.cumsum(segment_start) - 1
+    starts = np.flatnonzero(segment_start)
+    ends = np.append(starts[1:] - 1, n - 1)
+    n_groups = len(starts)
+
+    # Frequency: share of non-zero returns over the last `lookback` days of each series
+    recent = dates >= (dates[ends] - np.timedelta64(lookback, 'D'))[group_ids]
+    recent_ids = group_ids[recent]
+    recent_start = np.ones(len(recent_ids), dtype=bool)
+    recent_start[1:] = recent_ids[1:] != recent_ids[:-1]
+    recent_returns = _segment_returns(prices[recent], recent_start)
+    counted = ~np.isnan(recent_returns)
+    n_returns = np.bincount(recent_ids[counted], minlength=n_groups)
+    n_nonzero = np.bincount(recent_ids[counted], weights=recent_returns[counted] != 0, minlength=n_groups)
+    with np.errstate(invalid='ignore'):
+        is_daily = (n_nonzero / n_returns) > daily_threshold
+
+    # Native-frequency (daily) statistics over every series at once
+    returns = _segment_returns(prices, segment_start)
+    rolling_mean, rolling_std = rolling_mean_std_array(returns, window, starts)
+    zscores = _zscore_from_stats(returns, rolling_mean, rolling_std)
+
+    latest = {
+        'Return': returns[ends],
+        'RollingMean': rolling_mean[ends],
+        'RollingStd': rolling_std[ends],
+        'ZScore': zscores[ends],
+    }
+
+    weekly_groups = np.flatnonzero(~is_daily)
+    if frequency_aware and len(weekly_groups):
+        latest = {key: values.copy() for key, values in latest.items()}
+        weekly_rows = ~is_daily[group_ids]
+        w_ids = group_ids[weekly_rows]
+        w_dates = dates[weekly_rows]
+
+        # W-FRI week index: day 1 (1970-01-02) is a Friday
+        days = w_dates.astype('datetime64[D]').astype(np.int64)
+        day_of_week = (days + 3) % 7
+        week = (days + (4 - day_of_week) % 7 - 1) // 7
+
+        # resample('W-FRI').agg('last'): last non-NaN price per week, empty weeks kept as NaN
+        weekly_last = pd.Series(prices[weekly_rows]).groupby([w_ids, week], sort=False).last()  # rows already in (commodity, week) order
+        bin_ids = weekly_last.index.get_level_values(0).to_numpy()
+        bin_weeks = weekly_last.index.get_level_values(1).to_numpy()
+        first_week = pd.Series(bin_weeks).groupby(bin_ids).min()
+        span = pd.Series(bin_weeks).groupby(bin_ids).max() - first_week + 1
+        offsets = pd.Series(np.concatenate([[0], np.cumsum(span.to_numpy())[:-1]]), index=span.index)
+
+        dense_prices = np.full(int(span.sum()), np.nan)
+        dense_prices[offsets[bin_ids].to_numpy() + bin_weeks - first_week[bin_ids].to_numpy()] = weekly_last.to_numpy()
+        dense_start = np.zeros(len(dense_prices), dtype=bool)
+        dense_start[offsets.to_numpy()] = True
+
+        w_returns = _segment_returns(dense_prices, dense_start)
+        w_mean, w_std = rolling_mean_std_array(w_returns, window, offsets.to_numpy())
+        w_z = _zscore_from_stats(w_returns, w_mean, w_std)
+
+        # reindex(df.index).ffill(): each column takes its last non-NaN weekly
+        # value among the original dates that fall exactly on a W-FRI label
+        on_label = (day_of_week == 4) & (w_dates == w_dates.astype('datetime64[D]'))
+        label_ids = w_ids[on_label]
+        label_pos = offsets[label_ids].to_numpy() + week[on_label] - first_week[label_ids].to_numpy()
+        for key, values in (('Return', w_returns), ('RollingMean', w_mean),
+                            ('RollingStd', w_std), ('ZScore', w_z)):
+            picked = values[label_pos]
+            present = ~np.isnan(picked)
+            last_value = pd.Series(picked[present]).groupby(label_ids[present], sort=False).last()
+            latest[key][weekly_groups] = last_value.reindex(weekly_groups).to_numpy()
+
+    result = pd.DataFrame({
+        'Commodity': names[ends],
+        'Frequency': np.where(is_daily, 'daily', 'weekly'),
+        'Price': prices[ends],
+        **latest,
+        'Flag': flag_zscores(latest['ZScore']),
+    })
+    scored = set(names[ends])
+    result = result.set_index('Commodity').reindex([c for c in order if c in scored])
+    return result.rename_axis('Commodity').reset_index()[columns]
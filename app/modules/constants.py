@@ -40,4 +40,8 @@ class DisplayConfig:
 
     # Table display
     MAX_ROWS_PER_PAGE = 50
-    DEFAULT_ROW_HEIGHT = 35
\ No newline at end of file
+    DEFAULT_ROW_HEIGHT = 35
+
+    # Chart rendering
+    MAX_LINE_CHART_POINTS = 1000  # Line series longer than this are LTTB-downsampled
+    DEFAULT_TOP_MOVERS = 25  # Bars per side in the performance chart
@@ -4,12 +4,19 @@ import os
 from typing import Optional, Tuple, Dict, Any
 from modules.db_connection import get_db_connection, DatabaseConnection
 from modules.query_builder import CommodityQueryBuilder
+from modules.utils.cache_stats import observed_cache
 
-@st.cache_data(ttl=43200)  # Cache for 12 hours (43200 seconds)
+@observed_cache(st.cache_resource(
+    ttl=43200,  # Cache for 12 hours (43200 seconds)
+    show_spinner="Loading data...",
+    validate=lambda frames: frames[0] is not None  # retry a failed load on the next run
+))
 def load_data_from_database(connection_string: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Loads and preprocesses data from SQL Server database.
-    This function is cached to improve performance.
+    This function is cached to improve performance: the frames are loaded
+    once and shared by every rerun and session without being copied, so
+    callers must treat them as read-only.
     
     Args:
         connection_string: Optional ODBC connection string
@@ -70,8 +77,9 @@ def load_data_from_database(connection_string: Optional[str] = None) -> Tuple[pd
             price_df['Price'] = pd.to_numeric(price_df['Price'], errors='coerce')
             price_df['Date'] = pd.to_datetime(price_df['Date'], errors='coerce')
             
-            # Drop rows with missing data
+            # Drop rows with missing data (and the raw ticker, now in Ticker_Code)
             price_df.dropna(subset=['Date', 'Ticker_Code', 'Price'], inplace=True)
+            price_df.drop(columns='Ticker', inplace=True)
             
             # Map ticker codes to commodity names
             if ticker_to_name:
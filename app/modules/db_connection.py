@@ -7,6 +7,15 @@ import urllib.parse
 import os
 import re
 
+# Pool settings shared by the pymssql and pyodbc engines
+DEFAULT_POOL_OPTIONS = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 30,      # Seconds to wait for a free pooled connection
+    'pool_pre_ping': True,   # Verify connections before using
+    'pool_recycle': 3600,    # Recycle connections after 1 hour
+}
+
 def get_connection_string() -> str:
     """
     Get SQL Server connection string from environment variable or st.secrets
@@ -62,14 +71,16 @@ class DatabaseConnection:
     Supports both pyodbc (local development) and pymssql (Streamlit Cloud).
     """
 
-    def __init__(self, connection_string: str = None):
+    def __init__(self, connection_string: str = None, pool_options: Optional[Dict[str, Any]] = None):
         """
         Initialize database connection
 
         Args:
             connection_string: Connection string (ODBC format or pymssql URL). If None, gets from config
+            pool_options: Overrides for DEFAULT_POOL_OPTIONS (e.g. {'pool_size': 10})
         """
         self.conn_string = connection_string or get_connection_string()
+        self.pool_options = {**DEFAULT_POOL_OPTIONS, **(pool_options or {})}
         self.engine = None
         self.connection = None
         self._initialize_engine()
@@ -180,14 +191,11 @@ class DatabaseConnection:
             # Create engine with connection pooling
             engine = create_engine(
                 connection_url,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,   # Recycle connections after 1 hour
                 echo=False,          # Set to True for SQL debugging
                 connect_args={
                     "timeout": 30,   # Connection timeout in seconds
-                }
+                },
+                **self.pool_options
             )
 
             return engine
@@ -205,12 +213,9 @@ class DatabaseConnection:
                 engine = create_engine(
                     connection_url,
                     poolclass=QueuePool,
-                    pool_size=5,
-                    max_overflow=10,
-                    pool_pre_ping=True,
-                    pool_recycle=3600,
                     echo=False,
-                    fast_executemany=True
+                    fast_executemany=True,
+                    **self.pool_options
                 )
 
                 return engine
@@ -0,0 +1,58 @@
+"""
+Downsampling helpers for line charts.
+Keeps the visual shape of long price series while capping the number of
+points sent to Plotly.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Select point indices with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x: Monotonic x values (numeric or datetime64)
+        y: Y values, same length as x
+        n_out: Maximum number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices into x/y (all indices if no downsampling is needed)
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        # Keep the point forming the largest triangle with the previous pick and the next average
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
@@ -0,0 +1,193 @@
+"""
+Rolling statistics for price and return series.
+Uses a numba-compiled O(N) running-window kernel when numba is installed,
+bottleneck's moving-window functions when only bottleneck is, and pandas
+rolling windows otherwise. All paths follow pandas semantics: a window needs
+`window` finite values, the std uses ddof=1 and a window of identical values
+has a std of exactly 0.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:  # bottleneck is optional
+    BOTTLENECK_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _window_pass(values, start, stop, window, mean, std):
+        """Rolling mean / sample std over values[start:stop] in one O(N) pass.
+
+        Finite values are added to and removed from the window with Welford
+        updates, which stay accurate where raw sums of squares would cancel.
+        Results are written into mean/std, which must already hold NaN.
+        """
+        nobs = 0        # finite values in the current window
+        mean_x = 0.0
+        ssqdm = 0.0     # sum of squared differences from mean_x
+        n_bad = 0       # NaN/inf values in the current window
+        run = 0         # length of the run of identical values ending at i
+
+        for i in range(start, stop):
+            x = values[i]
+            if np.isfinite(x):
+                nobs += 1
+                delta = x - mean_x
+                mean_x += delta / nobs
+                ssqdm += delta * (x - mean_x)
+            else:
+                n_bad += 1
+            if np.isnan(x):
+                run = 0
+            else:
+                run = run + 1 if (i > start and x == values[i - 1]) else 1
+
+            if i - start >= window:
+                y = values[i - window]
+                if np.isfinite(y):
+                    nobs -= 1
+                    if nobs > 0:
+                        delta = y - mean_x
+                        mean_x -= delta / nobs
+                        ssqdm -= delta * (y - mean_x)
+                    else:
+                        mean_x = 0.0
+                        ssqdm = 0.0
+                else:
+                    n_bad -= 1
+
+            # Incomplete windows and windows holding NaN/inf stay NaN
+            if i - start < window - 1 or n_bad > 0:
+                continue
+
+            mean[i] = mean_x
+            if window == 1:
+                continue
+            if run >= window:
+                std[i] = 0.0
+            else:
+                var = ssqdm / (window - 1)
+                std[i] = np.sqrt(var) if var > 0.0 else 0.0
+
+    @njit(cache=True)
+    def _rolling_mean_std_kernel(values, window):
+        """Rolling mean / sample std over a whole float64 array."""
+        n = values.shape[0]
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        _window_pass(values, 0, n, window, mean, std)
+        return mean, std
+
+    @njit(cache=True, parallel=True)
+    def _segmented_mean_std_kernel(values, starts, window):
+        """Rolling mean / sample std restarted at every segment, segments in parallel."""
+        n = values.shape[0]
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        k = starts.shape[0]
+        for j in prange(k):
+            stop = starts[j + 1] if j + 1 < k else n
+            _window_pass(values, starts[j], stop, window, mean, std)
+        return mean, std
+
+
+def rolling_mean_std(values: pd.Series, window: int, segment_starts=None):
+    """
+    Compute the rolling mean and sample standard deviation of a series.
+
+    Args:
+        values (pd.Series): Numeric series (e.g. returns)
+        window (int): Number of observations per window
+        segment_starts (np.ndarray, optional): Sorted start positions of
+            independent segments (e.g. one per commodity). With numba the
+            segments run in parallel and with bottleneck one after another;
+            the pandas path rolls straight through, so each segment must
+            open with a NaN to keep windows apart.
+
+    Returns:
+        tuple: (rolling mean, rolling std) as float64 Series on values.index
+    """
+    if not (NUMBA_AVAILABLE or BOTTLENECK_AVAILABLE):
+        rolling = values.rolling(window=window)
+        return rolling.mean(), rolling.std()
+
+    mean, std = rolling_mean_std_array(values.to_numpy(dtype=np.float64, na_value=np.nan), window, segment_starts)
+    return pd.Series(mean, index=values.index), pd.Series(std, index=values.index)
+
+
+def rolling_mean_std_array(values: np.ndarray, window: int, segment_starts=None):
+    """
+    Array version of rolling_mean_std for callers that already hold NumPy data.
+
+    With numba, float32 input is read as-is (half the memory traffic) while
+    the window statistics are still accumulated in float64.
+
+    Returns:
+        tuple: (rolling mean, rolling std) as float64 arrays
+    """
+    arr = np.asarray(values)
+    if not (NUMBA_AVAILABLE and arr.dtype == np.float32):
+        arr = arr.astype(np.float64, copy=False)
+    if NUMBA_AVAILABLE and segment_starts is not None and len(segment_starts) > 1:
+        return _segmented_mean_std_kernel(arr, np.asarray(segment_starts, dtype=np.int64), window)
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_std_kernel(arr, window)
+    if BOTTLENECK_AVAILABLE and segment_starts is not None and len(segment_starts) > 1:
+        return _bottleneck_segmented_mean_std(arr, np.asarray(segment_starts, dtype=np.int64), window)
+    if BOTTLENECK_AVAILABLE:
+        return _bottleneck_mean_std(arr, window)
+    rolling = pd.Series(arr).rolling(window=window)
+    return rolling.mean().to_numpy(), rolling.std().to_numpy()
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile the numba kernels for the signatures the app uses (float64 and
+    float32 series, single and segmented), so the first chart or z-score
+    table does not pay the JIT delay. No-op without numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    for dtype in (np.float64, np.float32):
+        sample = np.arange(8, dtype=dtype)
+        _rolling_mean_std_kernel(sample, 3)
+    _segmented_mean_std_kernel(np.arange(8, dtype=np.float64), np.array([0, 4], dtype=np.int64), 3)
+
+
+def _bottleneck_mean_std(arr: np.ndarray, window: int):
+    """Rolling mean / sample std via bottleneck, patched to pandas semantics."""
+    # bottleneck rejects windows longer than the array; pandas returns all NaN
+    if len(arr) < window:
+        return np.full(len(arr), np.nan), np.full(len(arr), np.nan)
+    # inf counts as missing, so min_count=window leaves windows holding it NaN
+    # (bottleneck's running sums would otherwise stay poisoned after it leaves)
+    arr = np.where(np.isinf(arr), np.nan, arr)
+    mean = bn.move_mean(arr, window, min_count=window)
+    std = bn.move_std(arr, window, min_count=window, ddof=1)
+    if window > 1:
+        # Exact zero for constant windows (bottleneck can leave rounding noise)
+        constant = bn.move_max(arr, window, min_count=window) == bn.move_min(arr, window, min_count=window)
+        std[constant] = 0.0
+    else:
+        std[:] = np.nan
+    return mean, std
+
+
+def _bottleneck_segmented_mean_std(arr: np.ndarray, starts: np.ndarray, window: int):
+    """Per-segment _bottleneck_mean_std, so short segments get NaN instead of raising."""
+    mean = np.full(len(arr), np.nan)
+    std = np.full(len(arr), np.nan)
+    bounds = np.append(starts, len(arr))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        mean[start:stop], std[start:stop] = _bottleneck_mean_std(arr[start:stop], window)
+    return mean, std
@@ -2,10 +2,16 @@ import pandas as pd
 import requests
 import streamlit as st
 from datetime import datetime, timedelta
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from modules.utils.cache_stats import observed_cache
 
+# Concurrent TCBS requests per fetch_multiple_stocks call
+MAX_STOCK_FETCH_WORKERS = 4
 
-@st.cache_data(ttl=3600)
+
+@observed_cache(st.cache_data(ttl=3600))
 def fetch_historical_price(ticker: str, days: int = 365) -> pd.DataFrame:
     """Fetch stock historical price and volume data from TCBS API"""
     
@@ -86,41 +92,47 @@ def get_stock_tickers_from_impact(df_list: pd.DataFrame) -> list:
     return sorted(list(tickers))
 
 
-@st.cache_data(ttl=1800)
-def fetch_multiple_stocks(tickers: list, days: int = 365) -> dict:
-    """Fetch historical data for multiple stocks with rate limiting"""
-    
-    stock_data = {}
+def fetch_multiple_stocks(tickers: list, days: int = 365, progress_callback=None) -> dict:
+    """
+    Fetch historical data for multiple stocks concurrently.
+
+    Each ticker is fetched on a small thread pool (the per-ticker fetch is
+    network-bound and already cached), so total latency is roughly that of
+    the slowest request instead of the sum.
+
+    Args:
+        tickers: Stock tickers to fetch
+        days: Number of days of history per ticker
+        progress_callback: Optional callable(done, total), called from the
+            calling thread as each ticker finishes
+
+    Returns:
+        dict: {ticker: DataFrame} in the order of `tickers`, for tickers with data
+    """
     total_tickers = len(tickers)
-    
     if total_tickers == 0:
-        return stock_data
-    
-    # Progress bar
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    for i, ticker in enumerate(tickers):
-        status_text.text(f"Fetching data for {ticker}... ({i+1}/{total_tickers})")
-        
-        # Fetch data for this ticker
-        df = fetch_historical_price(ticker, days)
-        if df is not None and not df.empty:
-            stock_data[ticker] = df
-        
-        # Update progress
-        progress = (i + 1) / total_tickers
-        progress_bar.progress(progress)
-        
-        # Rate limiting - wait between requests
-        if i < total_tickers - 1:  # Don't wait after the last request
-            time.sleep(0.2)  # 200ms delay between requests
-    
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
-    
-    return stock_data
+        return {}
+
+    # Worker threads need the script run context for st.cache_data / st.warning
+    ctx = get_script_run_ctx()
+
+    def fetch_one(ticker):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch_historical_price(ticker, days)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_STOCK_FETCH_WORKERS, total_tickers)) as executor:
+        futures = {executor.submit(fetch_one, ticker): ticker for ticker in tickers}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(done, total_tickers)
+
+    return {
+        ticker: results[ticker]
+        for ticker in tickers
+        if results.get(ticker) is not None and not results[ticker].empty
+    }
 
 
 def calculate_stock_changes(stock_data: dict) -> pd.DataFrame:
@@ -135,8 +147,9 @@ def calculate_stock_changes(stock_data: dict) -> pd.DataFrame:
         if df is None or df.empty:
             continue
             
-        # Sort by date to ensure proper calculation
-        df = df.sort_values('tradingDate')
+        # Sort by date to ensure proper calculation (fetched frames already are)
+        if not df['tradingDate'].is_monotonic_increasing:
+            df = df.sort_values('tradingDate')
         
         if len(df) < 2:
             continue
@@ -209,7 +222,7 @@ def get_stock_data_for_commodities(df_list: pd.DataFrame, days: int = 365) -> pd
     st.info(f"Found {len(tickers)} unique stock tickers: {', '.join(tickers[:10])}{'...' if len(tickers) > 10 else ''}")
     
     # Fetch historical data for all tickers
-    stock_data = fetch_multiple_stocks(tickers, days)
+    stock_data = fetch_multiple_stocks(tickers, days=days)
     
     if not stock_data:
         st.warning("No stock data could be fetched")
@@ -1,41 +1,39 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 from st_aggrid import AgGrid, GridOptionsBuilder, JsCode
 
 
-def configure_page_style():
-    """
-    Applies custom CSS for the page with clean styling without background image.
-    """
-    page_style = f"""
+# Page-wide CSS, built once at import time
+_PAGE_STYLE = """
     <style>
     
     @import url('https://fonts.googleapis.com/css2?family=Manrope:wght@400;500;700&display=swap');
 
     /* Define color palette */
-    :root {{
+    :root {
         --primary-teal: #00816D;
         --secondary-red: #e11d48;
         --accent-green: #10b981;
         --bg-light: #f8fafc;
         --bg-white: #ffffff;
-    }}
+    }
 
     /* Apply font and base styles */
-    html, body, .st-emotion-cache-10trblm {{
+    html, body, .st-emotion-cache-10trblm {
         font-family: 'Manrope', sans-serif;
-    }}
+    }
     
     /* Main App Background - Clean light background */
-    .stApp {{
+    .stApp {
         background-color: var(--bg-light);
-    }}
+    }
 
     /* Sidebar Styling - Using default Streamlit background */
-    /* [data-testid="stSidebar"] > div:first-child {{
+    /* [data-testid="stSidebar"] > div:first-child {
         background-color: var(--primary-teal);
-    }} */
+    } */
     
     /* Sidebar text styling - Using default Streamlit colors */
     /* [data-testid="stSidebar"] h1,
@@ -44,57 +42,89 @@ def configure_page_style():
     [data-testid="stSidebar"] h4,
     [data-testid="stSidebar"] label,
     [data-testid="stSidebar"] .st-emotion-cache-16txtl3,
-    [data-testid="stSidebar"] .st-emotion-cache-10trblm {{
+    [data-testid="stSidebar"] .st-emotion-cache-10trblm {
         color: #FFFFFF;
-    }}
-    [data-testid="stSidebar"] .st-emotion-cache-1g8p9hb {{
+    }
+    [data-testid="stSidebar"] .st-emotion-cache-1g8p9hb {
          color: #E0E0E0;
-    }} */
+    } */
     
     /* Sidebar navigation links - Using default Streamlit colors */
-    /* [data-testid="stSidebarNav"] a span {{
+    /* [data-testid="stSidebarNav"] a span {
         color: #FFFFFF;
-    }}
-    [data-testid="stSidebarNav"] a[aria-current="page"] span {{
+    }
+    [data-testid="stSidebarNav"] a[aria-current="page"] span {
         color: #FFFFFF;
-    }} */
+    } */
     
     /* Hide sidebar collapse button text */
-    [data-testid="stSidebarCollapseButton"] p {{
+    [data-testid="stSidebarCollapseButton"] p {
         display: none;
-    }}
+    }
 
     /* Main Content Styling */
-    .block-container {{
+    .block-container {
         background-color: var(--bg-white);
         padding: 2rem 3rem;
         border-radius: 0.75rem;
         margin: 1rem;
         box-shadow: 0 1px 3px 0 rgb(0 0 0 / 0.1);
-    }}
+    }
     
     /* Header styles */
-    h1, h2, h3 {{
+    h1, h2, h3 {
         color: var(--primary-teal);
         font-weight: 700;
-    }}
-    .st-emotion-cache-10trblm, .st-emotion-cache-16txtl3 {{
+    }
+    .st-emotion-cache-10trblm, .st-emotion-cache-16txtl3 {
         color: var(--primary-teal);
-    }}
+    }
    
     /* Content wrapper styles */
-    .metric-container-wrapper, .chart-wrapper {{
+    .metric-container-wrapper, .chart-wrapper {
         background-color: var(--bg-white);
         padding: 1.5rem;
         border-radius: 0.75rem;
         box-shadow: 0 1px 3px 0 rgb(0 0 0 / 0.1);
         margin-bottom: 2rem;
         border: 1px solid #e2e8f0;
-    }}
+    }
     
     </style>
     """
-    st.markdown(page_style, unsafe_allow_html=True)
+
+
+# Dashboard title, sent in the same markdown element as the page CSS
+_PAGE_HEADER = """
+    <h1 style='text-align: center; color: #00816D; font-size: 2.5rem; font-weight: 700; margin-bottom: 0.5rem;'>
+        Commodity Market Dashboard
+    </h1>
+    <p style='text-align: center; color: #6B7280; font-size: 1rem; margin-bottom: 2rem;'>
+        Real-time commodity prices and market analysis
+    </p>
+    """
+
+# Main-page section header, filled with str.format
+_SECTION_HEADER_HTML = (
+    "<h3 style='color: #00816D; font-size: 1rem; font-weight: 400; text-align: left;'>"
+    "{title}</h3>"
+)
+
+
+def configure_page_style():
+    """
+    Applies custom CSS for the page with clean styling without background image,
+    together with the dashboard title.
+    """
+    # Streamlit removes elements that are not re-emitted on a rerun, so the
+    # style block is sent every run; only the string itself is prebuilt.
+    st.markdown(_PAGE_STYLE + _PAGE_HEADER, unsafe_allow_html=True)
+
+def section_header(title: str):
+    """
+    Renders a main-page section header from the shared template.
+    """
+    st.markdown(_SECTION_HEADER_HTML.format(title=title), unsafe_allow_html=True)
 
 def display_market_metrics(df: pd.DataFrame):
     """
@@ -307,26 +337,25 @@ def style_dataframe(df: pd.DataFrame):
     }
     percent_cols = ['%Day', '%Week', '%Month', '%Quarter', '%YTD']
 
-    # Hàm style (giữ nguyên)
-    def style_percent_cell(val):
-        if pd.isna(val):
-            return 'font-weight: 300;'
-        
-        if val > 0:
-            bg_intensity = min(abs(val) * 10, 1.5)
-            return f'background-color: rgba(16, 185, 129, {bg_intensity}); font-weight: 300;'
-        elif val < 0:
-            bg_intensity = min(abs(val) * 10, 1.5)
-            return f'background-color: rgba(225, 29, 72, {bg_intensity}); font-weight: 300;'
-        else:
-            return 'background-color: #FFFFFF; font-weight: 300;'
+    # Style cả cột một lần (vectorized) thay vì gọi hàm Python cho từng ô
+    def style_percent_column(col: pd.Series):
+        intensity = (col.abs() * 10).clip(upper=1.5).astype(str)
+        return np.select(
+            [col > 0, col < 0, col == 0],
+            [
+                'background-color: rgba(16, 185, 129, ' + intensity + '); font-weight: 300;',
+                'background-color: rgba(225, 29, 72, ' + intensity + '); font-weight: 300;',
+                'background-color: #FFFFFF; font-weight: 300;',
+            ],
+            default='font-weight: 300;'
+        )
 
     styler = df_to_style.style.format(format_dict, na_rep='—')
-    
-    for col in percent_cols:
-        if col in df_to_style.columns:
-            styler = styler.map(style_percent_cell, subset=[col])
-    
+
+    styled_percent_cols = [col for col in percent_cols if col in df_to_style.columns]
+    if styled_percent_cols:
+        styler = styler.apply(style_percent_column, axis=0, subset=styled_percent_cols)
+
     text_columns = ['Commodities', 'Sector', 'Nation', 'Change type', 'Impact']
     
     table_styles = [
@@ -387,14 +416,12 @@ def style_dataframe(df: pd.DataFrame):
     
     return styler
 
-def display_aggrid_table(df: pd.DataFrame):
+@st.cache_data(ttl=43200, show_spinner=False)
+def prepare_grid_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Display a modern AG-Grid table with light theme and conditional formatting.
+    Build the row data for the price AG-Grid (cached, so unchanged filters
+    don't redo the column selection, renames and formatting on every rerun).
     """
-    if df.empty:
-        st.warning("No data to display")
-        return
-    
     # Prepare dataframe with only specified columns
     display_columns = ['Commodities', 'Sector', 'Current Price', 
                       '%Day', '%Week', '%Month', '%Quarter', '%YTD',
@@ -420,7 +447,20 @@ def display_aggrid_table(df: pd.DataFrame):
     percent_cols = ["%Day", "%Week", "%Month", "%Quarter", "%YTD"]
     for col in percent_cols:
         if col in df_display.columns:
-            df_display[col] = df_display[col].apply(lambda x: round(x * 100, 2) if pd.notna(x) else x)
+            df_display[col] = (df_display[col] * 100).round(2)
+
+    return df_display
+
+def display_aggrid_table(df: pd.DataFrame):
+    """
+    Display a modern AG-Grid table with light theme and conditional formatting.
+    """
+    if df.empty:
+        st.warning("No data to display")
+        return
+    
+    df_display = prepare_grid_frame(df)
+    percent_cols = ["%Day", "%Week", "%Month", "%Quarter", "%YTD"]
 
     # JavaScript conditional color for percentage columns - light theme
     color_cells = JsCode("""
@@ -4,10 +4,14 @@ Utility modules for AI integration
 
 from .error_handler import safe_execute, retry_on_failure, create_error_response
 from .rate_limiter import get_perplexity_rate_limiter
+from .cache_stats import observed_cache, get_cache_stats, reset_cache_stats
 
 __all__ = [
     'safe_execute',
     'retry_on_failure',
     'create_error_response',
-    'get_perplexity_rate_limiter'
+    'get_perplexity_rate_limiter',
+    'observed_cache',
+    'get_cache_stats',
+    'reset_cache_stats'
 ]
\ No newline at end of file
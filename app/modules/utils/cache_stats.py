@@ -0,0 +1,96 @@
+"""
+Cache Observability Module
+Counts calls, cache misses and wall time of Streamlit-cached functions
+"""
+
+import functools
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(name: str, calls: int = 0, misses: int = 0, elapsed_ns: int = 0) -> None:
+    """Add to the counters of one cached function"""
+    with _stats_lock:
+        entry = _stats.setdefault(name, {'calls': 0, 'misses': 0, 'total_ns': 0})
+        entry['calls'] += calls
+        entry['misses'] += misses
+        entry['total_ns'] += elapsed_ns
+
+
+def observed_cache(cache_decorator: Callable, name: Optional[str] = None):
+    """
+    Apply a Streamlit cache decorator and count how the cache behaves
+
+    The undecorated function counts a miss each time it actually runs; the
+    returned wrapper counts every call and its wall time (including the
+    argument hashing done by Streamlit), so hits = calls - misses.
+
+    Args:
+        cache_decorator: e.g. st.cache_data(ttl=3600, show_spinner=False)
+        name: Name shown in the stats (defaults to the function name)
+
+    Returns:
+        Decorator producing the cached, counted function
+
+    Example:
+        @observed_cache(st.cache_data(ttl=3600))
+        def load_prices(...): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        stat_name = name or func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _record(stat_name, misses=1)
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                _record(stat_name, calls=1, elapsed_ns=time.perf_counter_ns() - start)
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> pd.DataFrame:
+    """
+    Snapshot of the counters of all observed cached functions
+
+    Returns:
+        DataFrame indexed by function name with Calls, Hits, Misses,
+        Hit Rate and Avg ms (mean wall time per call)
+    """
+    with _stats_lock:
+        snapshot = {key: dict(entry) for key, entry in _stats.items()}
+
+    stats = pd.DataFrame.from_dict(
+        snapshot, orient='index', columns=['calls', 'misses', 'total_ns']
+    ).astype('int64')
+    calls = stats['calls'].where(stats['calls'] > 0)
+    return pd.DataFrame({
+        'Calls': stats['calls'],
+        'Hits': stats['calls'] - stats['misses'],
+        'Misses': stats['misses'],
+        'Hit Rate': (stats['calls'] - stats['misses']) / calls,
+        'Avg ms': stats['total_ns'] / calls / 1e6,
+    }).sort_index()
+
+
+def reset_cache_stats() -> None:
+    """Clear all counters"""
+    with _stats_lock:
+        _stats.clear()
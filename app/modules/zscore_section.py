@@ -0,0 +1,460 @@
+"""
+Z-score and price band analysis sections of the dashboard.
+Both render as fragments, so their own controls only rerun the section
+instead of the whole page.
+"""
+
+import math
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+
+from modules.calculations import compute_latest_zscores, compute_price_bands
+from modules.styling import section_header
+
+# Band position label per side of the bands (+1 above, -1 below, 0 within)
+BAND_POSITIONS = {
+    1: ("🔴", "Above Upper Band"),
+    -1: ("🔵", "Below Lower Band"),
+    0: ("🟢", "Within Bands"),
+}
+
+
+@st.fragment
+def render_zscore_section(df_data, filtered_df, commodity_partitions, data_last_updated):
+    """
+    Render the Z-score debugging table, its summary and the price bands below it.
+
+    Args:
+        df_data (pd.DataFrame): Long price table with Commodities, Date, Price
+        filtered_df (pd.DataFrame): Analysis table after the sidebar filters
+        commodity_partitions (dict): Date-sorted price history per commodity
+        data_last_updated: Latest date of the loaded data (cache key)
+    """
+    section_header("📊 Z-Score Analysis (Debugging Table)")
+    
+    # Add controls
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        zscore_window = st.slider(
+            "Z-Score Window",
+            min_value=30,
+            max_value=60,
+            value=30,
+            step=5,
+            help="Number of observations for rolling statistics"
+        )
+
+    with col2:
+        frequency_aware = st.checkbox(
+            "Frequency-Aware Mode",
+            value=True,
+            help="Adjust Z-scores based on detected update frequency (daily/weekly)"
+        )
+
+    if frequency_aware:
+        st.info(f"🎯 **Frequency-Aware Mode**: Z-scores are calculated using {zscore_window} observations at each commodity's native frequency (daily/weekly), providing accurate volatility measures.")
+    else:
+        st.info(f"📊 **Raw Mode**: Z-scores show how many standard deviations today's return is from the {zscore_window}-day rolling mean. Weekly commodities may show inflated values.")
+
+    # Latest z-score row for every filtered commodity (cached on data, filter and window)
+    latest_zscores = compute_latest_zscores(
+        df_data,
+        tuple(filtered_df['Commodities'].unique()),
+        window=zscore_window,
+        frequency_aware=frequency_aware,
+        lookback=90
+    )
+    frequency = latest_zscores['Frequency'].str.capitalize()
+
+    if frequency_aware:
+        # Window label depends on each commodity's native frequency
+        is_weekly = (frequency == 'Weekly').to_numpy()
+        window_labels = pd.unique(np.where(is_weekly, f"{zscore_window}W", f"{zscore_window}D"))
+        zscore_table = pd.DataFrame({
+            'Commodity': latest_zscores['Commodity'],
+            'Update Frequency': frequency,
+            'Latest Price': latest_zscores['Price'],
+            'Return (%)': latest_zscores['Return'] * 100
+        })
+        stat_columns = {}
+        for window_label in window_labels:
+            label_rows = is_weekly if window_label.endswith('W') else ~is_weekly
+            stat_columns[f'{window_label} Mean (%)'] = latest_zscores['RollingMean'].where(label_rows) * 100
+            stat_columns[f'{window_label} Std Dev (%)'] = latest_zscores['RollingStd'].where(label_rows) * 100
+        # Columns of the first label seen come right after the return,
+        # any other label's columns go last
+        first_stats = list(stat_columns)[:2]
+        for col in first_stats:
+            zscore_table[col] = stat_columns.pop(col)
+        zscore_table['Adjusted Z-Score'] = latest_zscores['ZScore']
+        zscore_table['Flag'] = latest_zscores['Flag']
+        zscore_table['Alert Level'] = latest_zscores['Flag'].str.capitalize().replace('', 'Normal')
+        for col, values in stat_columns.items():
+            zscore_table[col] = values
+    else:
+        zscore_table = pd.DataFrame({
+            'Commodity': latest_zscores['Commodity'],
+            'Update Frequency': frequency,
+            'Latest Price': latest_zscores['Price'],
+            'Daily Return (%)': latest_zscores['Return'] * 100,
+            f'{zscore_window}D Mean Return (%)': latest_zscores['RollingMean'] * 100,
+            f'{zscore_window}D Std Dev (%)': latest_zscores['RollingStd'] * 100,
+            'Raw Z-Score': latest_zscores['ZScore'],
+            'Status': np.where(latest_zscores['ZScore'].abs() > 2, 'Unusual', 'Normal')
+        })
+
+    # Display the table
+    if not zscore_table.empty:
+        # Sort by absolute Z-score (most unusual first)
+        if frequency_aware:
+            zscore_col = 'Adjusted Z-Score'
+        else:
+            zscore_col = 'Raw Z-Score'
+
+        zscore_table['Abs_ZScore'] = zscore_table[zscore_col].abs()
+        zscore_table = zscore_table.sort_values('Abs_ZScore', ascending=False)
+        zscore_table = zscore_table.drop('Abs_ZScore', axis=1)
+        
+        # Format the display
+        st.markdown("#### Latest Z-Scores for All Commodities")
+        
+        # Apply styling to highlight unusual values (one vectorized pass per column)
+        def highlight_zscore(column):
+            abs_z = column.abs().to_numpy()
+            return np.select(
+                [abs_z > 3, abs_z > 2, abs_z > 1],
+                ['background-color: #ff4444; color: white',
+                 'background-color: #ffaa00; color: white',
+                 'background-color: #ffff44'],
+                default=''
+            )
+
+        # Apply styling to frequency column
+        frequency_styles = {
+            'Daily': 'color: #00816D; font-weight: bold',
+            'Weekly': 'color: #1f77b4; font-weight: bold'
+        }
+
+        def style_frequency(column):
+            return column.map(frequency_styles).fillna('')
+
+        # Apply styling to alert levels (for frequency-aware mode)
+        alert_styles = {
+            'Extreme': 'background-color: #ff4444; color: white; font-weight: bold',
+            'Notable': 'background-color: #ffaa00; color: white; font-weight: bold',
+            'Notice': 'background-color: #ffff44; font-weight: bold'
+        }
+
+        def style_alert(column):
+            return column.map(alert_styles).fillna('')
+        
+        # Format numeric columns based on mode
+        if frequency_aware:
+            # Build dynamic format dict for frequency-aware mode
+            format_dict = {'Latest Price': '{:.2f}', 'Return (%)': '{:.2f}', 'Adjusted Z-Score': '{:.2f}'}
+
+            # Add dynamic column formatting
+            for col in zscore_table.columns:
+                if 'Mean (%)' in col or 'Std Dev (%)' in col:
+                    format_dict[col] = '{:.3f}'
+
+            styled_table = zscore_table.style.apply(
+                highlight_zscore,
+                subset=['Adjusted Z-Score']
+            ).apply(
+                style_frequency,
+                subset=['Update Frequency']
+            ).apply(
+                style_alert,
+                subset=['Alert Level'] if 'Alert Level' in zscore_table.columns else []
+            ).format(format_dict, na_rep='-')
+        else:
+            format_dict = {
+                'Latest Price': '{:.2f}',
+                'Daily Return (%)': '{:.2f}',
+                f'{zscore_window}D Mean Return (%)': '{:.3f}',
+                f'{zscore_window}D Std Dev (%)': '{:.3f}',
+                'Raw Z-Score': '{:.2f}'
+            }
+
+            styled_table = zscore_table.style.apply(
+                highlight_zscore,
+                subset=['Raw Z-Score']
+            ).apply(
+                style_frequency,
+                subset=['Update Frequency']
+            ).format(format_dict, na_rep='-')
+        
+        st.dataframe(styled_table, width='stretch', height=400)
+        
+        # Summary statistics
+        col1, col2, col3, col4 = st.columns(4)
+
+        if frequency_aware:
+            with col1:
+                extreme_count = (zscore_table['Alert Level'] == 'Extreme').sum() if 'Alert Level' in zscore_table.columns else 0
+                notable_count = (zscore_table['Alert Level'] == 'Notable').sum() if 'Alert Level' in zscore_table.columns else 0
+                st.metric("Alerts", f"Extreme:{extreme_count} Notable:{notable_count}")
+            with col2:
+                avg_zscore = zscore_table['Adjusted Z-Score'].mean()
+                st.metric("Avg Adjusted Z-Score", f"{avg_zscore:.2f}" if not math.isnan(avg_zscore) else "-")
+            with col3:
+                max_zscore = zscore_table['Adjusted Z-Score'].abs().max()
+                st.metric("Max |Adjusted Z-Score|", f"{max_zscore:.2f}" if not math.isnan(max_zscore) else "-")
+        else:
+            with col1:
+                unusual_count = (zscore_table['Status'] == 'Unusual').sum() if 'Status' in zscore_table.columns else 0
+                st.metric("Unusual Movements (|Z| > 2)", unusual_count)
+            with col2:
+                avg_zscore = zscore_table['Raw Z-Score'].mean()
+                st.metric("Average Raw Z-Score", f"{avg_zscore:.2f}" if not math.isnan(avg_zscore) else "-")
+            with col3:
+                max_zscore = zscore_table['Raw Z-Score'].abs().max()
+                st.metric("Max |Raw Z-Score|", f"{max_zscore:.2f}" if not math.isnan(max_zscore) else "-")
+
+        with col4:
+            daily_count = (zscore_table['Update Frequency'] == 'Daily').sum()
+            weekly_count = (zscore_table['Update Frequency'] == 'Weekly').sum()
+            st.metric("Update Frequency", f"Daily: {daily_count} | Weekly: {weekly_count}")
+        
+        # Additional insights
+        st.markdown("#### Interpretation Guide:")
+
+        if frequency_aware:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                **Frequency-Adjusted Z-Score:**
+                - **Z = 0**: Return equals historical average at native frequency
+                - **|Z| ≥ 1**: 📢 **Notice** - Worth monitoring
+                - **|Z| ≥ 2**: 🔶 **Notable** - Significant move
+                - **|Z| ≥ 3**: 🔴 **Extreme** - Very unusual move
+
+                *Z-scores use {zscore_window} observations at each commodity's native frequency*
+                """)
+
+            with col2:
+                st.markdown("""
+                **Update Frequency Detection:**
+                - **Daily**: >50% of days have price changes
+                - **Weekly**: ≤50% of days have price changes
+
+                **Advantage**: Weekly commodities are resampled to weekly frequency,
+                eliminating inflated volatility from forward-filled zeros.
+                """)
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                **Raw Z-Score Interpretation:**
+                - **Z-Score = 0**: Return is exactly at the {zscore_window}-day average
+                - **|Z-Score| < 1**: Normal daily movement (within 1 standard deviation)
+                - **1 < |Z-Score| < 2**: Moderately unusual movement
+                - **2 < |Z-Score| < 3**: Unusual movement (highlighted in orange)
+                - **|Z-Score| > 3**: Very unusual movement (highlighted in red)
+                """)
+
+            with col2:
+                st.markdown("""
+                **Update Frequency:**
+                - **Daily**: >50% of days have price changes
+                - **Weekly**: ≤50% of days have price changes
+
+                ⚠️ **Warning**: Weekly commodities may show inflated Z-scores due to
+                forward-filled zeros affecting volatility calculations.
+                """)
+
+        render_price_bands_section(filtered_df, commodity_partitions, data_last_updated, zscore_window)
+
+    else:
+        st.warning("Not enough data to calculate Z-scores.")
+
+
+@st.fragment
+def render_price_bands_section(filtered_df, commodity_partitions, data_last_updated, default_window):
+    """
+    Render the price bands chart for one commodity of the filtered table.
+
+    Args:
+        filtered_df (pd.DataFrame): Analysis table after the sidebar filters
+        commodity_partitions (dict): Date-sorted price history per commodity
+        data_last_updated: Latest date of the loaded data (cache key)
+        default_window (int): Initial moving average window (the Z-score window)
+    """
+    st.markdown("---")
+    section_header("📈 Price Bands Analysis")
+
+    # Chart controls
+    col1, col2, col3 = st.columns([2, 1, 1])
+
+    with col1:
+        # Commodity selector
+        available_commodities = sorted(filtered_df['Commodities'].unique())
+        selected_commodity = st.selectbox(
+            "Select Commodity for Analysis",
+            available_commodities,
+            index=0 if available_commodities else None,
+            key="price_bands_commodity"
+        )
+
+    with col2:
+        # N-value selector for standard deviations
+        n_std = st.slider(
+            "Std Dev Bands (n)",
+            min_value=1.0,
+            max_value=3.0,
+            value=2.0,
+            step=0.5,
+            help="Number of standard deviations for price bands"
+        )
+
+    with col3:
+        # Window selector (same as zscore window)
+        band_window = st.slider(
+            "Moving Avg Window",
+            min_value=30,
+            max_value=60,
+            value=default_window,
+            step=5,
+            help="Window for calculating moving average and bands"
+        )
+
+    if selected_commodity:
+        # Get data for selected commodity
+        commodity_data = commodity_partitions.get(selected_commodity)
+
+        if commodity_data is not None and len(commodity_data) > band_window:
+            # Partitions are already date-sorted; the chart and metrics read
+            # parallel arrays instead of a frame with the stats assigned as columns
+            dates = commodity_data['Date'].to_numpy()
+            prices = commodity_data['Price'].to_numpy(dtype=np.float64)
+
+            # Band statistics already fetched in this session for this commodity and
+            # data load, per window: a dict hit skips the st.cache_data lookup and
+            # the copy it hands back
+            memo_key = (selected_commodity, data_last_updated)
+            band_memo = st.session_state.get('price_bands_memo')
+            if band_memo is None or band_memo['key'] != memo_key:
+                band_memo = {'key': memo_key, 'bands': {}}
+                st.session_state['price_bands_memo'] = band_memo
+
+            bands = band_memo['bands'].get(band_window)
+            if bands is None:
+                # Rolling statistics on price (not returns), cached per commodity and window.
+                # float32 input is plenty for 2-decimal band metrics and halves the
+                # kernel's reads; the statistics come back as float64.
+                bands = compute_price_bands(
+                    selected_commodity,
+                    band_window,
+                    data_last_updated,
+                    prices.astype(np.float32)
+                )
+                band_memo['bands'][band_window] = bands
+            moving_avg, moving_std = bands['MA'], bands['Std']
+            band_width = n_std * moving_std
+            upper_band = moving_avg + band_width
+            lower_band = moving_avg - band_width
+
+            # Create the plot
+            fig = go.Figure()
+
+            # Add price line
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=prices,
+                mode='lines',
+                name='Spot Price',
+                line=dict(color='#1f77b4', width=2),
+                hovertemplate='Date: %{x|%Y-%m-%d}<br>Price: $%{y:.2f}<extra></extra>'
+            ))
+
+            # Add moving average
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=moving_avg,
+                mode='lines',
+                name=f'{band_window}D Moving Avg',
+                line=dict(color='#ff7f0e', width=2, dash='dash'),
+                hovertemplate='Date: %{x|%Y-%m-%d}<br>MA: $%{y:.2f}<extra></extra>'
+            ))
+
+            # Add upper band
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=upper_band,
+                mode='lines',
+                name=f'Upper Band (+{n_std}σ)',
+                line=dict(color='#2ca02c', width=1.5, dash='dot'),
+                hovertemplate='Date: %{x|%Y-%m-%d}<br>Upper: $%{y:.2f}<extra></extra>'
+            ))
+
+            # Add lower band
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=lower_band,
+                mode='lines',
+                name=f'Lower Band (-{n_std}σ)',
+                line=dict(color='#d62728', width=1.5, dash='dot'),
+                fill='tonexty',
+                fillcolor='rgba(128, 128, 128, 0.1)',
+                hovertemplate='Date: %{x|%Y-%m-%d}<br>Lower: $%{y:.2f}<extra></extra>'
+            ))
+
+            # Update layout
+            fig.update_layout(
+                title=f"{selected_commodity} - Price Bands Analysis",
+                xaxis_title="Date",
+                yaxis_title="Price",
+                height=500,
+                hovermode='x unified',
+                showlegend=True,
+                legend=dict(
+                    yanchor="top",
+                    y=0.99,
+                    xanchor="left",
+                    x=0.01,
+                    bgcolor="rgba(255, 255, 255, 0.8)"
+                ),
+                xaxis=dict(
+                    rangeslider=dict(visible=True, thickness=0.05),
+                    type="date"
+                )
+            )
+
+            # Display the chart
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Show current position relative to bands (last elements of the arrays)
+            latest_price = float(prices[-1])
+            latest_ma = float(moving_avg[-1])
+            latest_std = float(moving_std[-1])
+            if not (math.isnan(latest_ma) or math.isnan(latest_std)):
+                col1, col2, col3, col4 = st.columns(4)
+
+                with col1:
+                    st.metric("Current Price", f"${latest_price:.2f}")
+
+                with col2:
+                    st.metric(f"{band_window}D Average", f"${latest_ma:.2f}")
+
+                with col3:
+                    # Position within bands: +1 above, -1 below, 0 within
+                    side = int(latest_price > upper_band[-1]) - int(latest_price < lower_band[-1])
+                    color, position = BAND_POSITIONS[side]
+                    st.metric("Band Position", f"{color} {position}")
+
+                with col4:
+                    # Calculate how many std devs from mean
+                    if latest_std > 0:
+                        current_z = (latest_price - latest_ma) / latest_std
+                        st.metric("Current σ from Mean", f"{current_z:.2f}σ")
+                    else:
+                        st.metric("Current σ from Mean", "N/A")
+
+        else:
+            st.warning(f"Not enough data points (need >{band_window}) to calculate price bands for {selected_commodity}.")
+    else:
+        st.info("Please select a commodity to view price bands analysis.")